@@ -0,0 +1,23 @@
+"""Index api_keys.key_prefix for X-API-Key lookups
+
+Revision ID: 004
+Revises: 003
+Create Date: 2026-10-17
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "004"
+down_revision: Union[str, None] = "003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index("idx_api_keys_key_prefix", "api_keys", ["key_prefix"])
+
+
+def downgrade() -> None:
+    op.drop_index("idx_api_keys_key_prefix", table_name="api_keys")
@@ -0,0 +1,56 @@
+"""Replace lat/lng B-trees with a spatial index
+
+Uses a PostGIS geography column with a GiST index when the extension is
+available. Otherwise falls back to a GiST index on the built-in point(lng, lat)
+expression. Both are maintained by Postgres, so existing rows are backfilled
+here and new rows need no application changes.
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-10-17
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "005"
+down_revision: Union[str, None] = "004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _postgis_available() -> bool:
+    bind = op.get_bind()
+    return (
+        bind.execute(
+            sa.text("SELECT 1 FROM pg_available_extensions WHERE name = 'postgis'")
+        ).scalar()
+        is not None
+    )
+
+
+def upgrade() -> None:
+    if _postgis_available():
+        op.execute("CREATE EXTENSION IF NOT EXISTS postgis")
+        # Generated column: computed for existing rows by this ALTER and kept
+        # in sync on every INSERT/UPDATE of lat/lng.
+        op.execute(
+            "ALTER TABLE events ADD COLUMN geog geography(Point, 4326) "
+            "GENERATED ALWAYS AS (ST_SetSRID(ST_MakePoint(lng, lat), 4326)::geography) STORED"
+        )
+        op.execute("CREATE INDEX idx_events_geog ON events USING gist (geog)")
+    else:
+        op.execute("CREATE INDEX idx_events_point ON events USING gist (point(lng, lat))")
+
+    op.drop_index("idx_events_lng", table_name="events")
+    op.drop_index("idx_events_lat", table_name="events")
+
+
+def downgrade() -> None:
+    op.create_index("idx_events_lat", "events", ["lat"])
+    op.create_index("idx_events_lng", "events", ["lng"])
+    op.execute("DROP INDEX IF EXISTS idx_events_point")
+    op.execute("DROP INDEX IF EXISTS idx_events_geog")
+    op.execute("ALTER TABLE events DROP COLUMN IF EXISTS geog")
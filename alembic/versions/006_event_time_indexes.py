@@ -0,0 +1,39 @@
+"""Indexes for the nearby time filter and keyset ordering
+
+Revision ID: 006
+Revises: 005
+Create Date: 2026-10-17
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "006"
+down_revision: Union[str, None] = "005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # ORDER BY start_at, event_id and the (start_at, event_id) > (...) keyset.
+    op.create_index("idx_events_start_at_event_id", "events", ["start_at", "event_id"])
+    # "Not ended yet": COALESCE(end_at, 'infinity') >= now(). Must match the
+    # expression in event_service exactly to be used.
+    op.create_index(
+        "idx_events_effective_end",
+        "events",
+        [sa.text("COALESCE(end_at, 'infinity'::timestamp with time zone)")],
+    )
+    # event_type filters combined with the start_at order. audience has only
+    # three values, so it is left to the filter.
+    op.create_index(
+        "idx_events_type_start_at", "events", ["event_type", "start_at", "event_id"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_events_type_start_at", table_name="events")
+    op.drop_index("idx_events_effective_end", table_name="events")
+    op.drop_index("idx_events_start_at_event_id", table_name="events")
@@ -0,0 +1,41 @@
+"""Changes feed: event tombstones and (updated_at, event_id) index
+
+Revision ID: 007
+Revises: 006
+Create Date: 2026-10-17
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "007"
+down_revision: Union[str, None] = "006"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "event_tombstones",
+        sa.Column("event_id", sa.String(26), nullable=False),
+        sa.Column("agent_id", sa.UUID(), nullable=False),
+        sa.Column("lat", sa.Double(), nullable=False),
+        sa.Column("lng", sa.Double(), nullable=False),
+        sa.Column("deleted_at", sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint("event_id"),
+    )
+    # Keyset order of the changes feed, for live events and tombstones alike.
+    op.create_index(
+        "idx_event_tombstones_deleted_at_event_id",
+        "event_tombstones",
+        ["deleted_at", "event_id"],
+    )
+    op.create_index("idx_events_updated_at_event_id", "events", ["updated_at", "event_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("idx_events_updated_at_event_id", table_name="events")
+    op.drop_index("idx_event_tombstones_deleted_at_event_id", table_name="event_tombstones")
+    op.drop_table("event_tombstones")
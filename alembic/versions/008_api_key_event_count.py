@@ -0,0 +1,36 @@
+"""Maintained api_keys.event_count and admin agent listing indexes
+
+Revision ID: 008
+Revises: 007
+Create Date: 2026-10-17
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "008"
+down_revision: Union[str, None] = "007"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "api_keys",
+        sa.Column("event_count", sa.Integer(), nullable=False, server_default="0"),
+    )
+    # Kept current by the event create/delete paths from here on.
+    op.execute(
+        "UPDATE api_keys SET event_count = counts.n "
+        "FROM (SELECT agent_id, count(*) AS n FROM events GROUP BY agent_id) AS counts "
+        "WHERE api_keys.id = counts.agent_id"
+    )
+    # Keyset order of GET /v1/admin/agents (newest first).
+    op.create_index("idx_api_keys_created_at_id", "api_keys", ["created_at", "id"])
+
+
+def downgrade() -> None:
+    op.drop_index("idx_api_keys_created_at_id", table_name="api_keys")
+    op.drop_column("api_keys", "event_count")
@@ -0,0 +1,29 @@
+"""Index events by (agent_id, created_at, event_id)
+
+Revision ID: 009
+Revises: 008
+Create Date: 2026-10-17
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "009"
+down_revision: Union[str, None] = "008"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Keyset order of the admin per-agent event listing; also serves every
+    # other agent_id lookup (bulk deletes, batch filters).
+    op.create_index(
+        "idx_events_agent_id_created_at",
+        "events",
+        ["agent_id", "created_at", "event_id"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_events_agent_id_created_at", table_name="events")
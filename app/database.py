@@ -1,17 +1,89 @@
+import asyncio
+import logging
+import time
+import uuid
 from collections.abc import AsyncGenerator
+from typing import Any, Dict
 
+from sqlalchemy import exc, text
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool
 
 from app.config import settings
 
 # Import models so they are registered with Base (needed for create_all, etc.)
 import app.models  # noqa: F401
 
-engine = create_async_engine(
-    settings.database_url,
-    echo=not settings.is_production,
-    pool_pre_ping=True,
-)
+logger = logging.getLogger(__name__)
+
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool that records how long checkouts take, including
+    time spent queueing for a free connection, for /v1/admin/metrics."""
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            self.timeouts += 1
+            raise
+        finally:
+            waited = time.perf_counter() - start
+            self.checkouts += 1
+            self.wait_seconds_total += waited
+            self.wait_seconds_max = max(self.wait_seconds_max, waited)
+
+    def stats(self) -> Dict[str, Any]:
+        capacity = self.size() + self._max_overflow if self._max_overflow > -1 else None
+        checked_out = self.checkedout()
+        return {
+            "size": self.size(),
+            "max_overflow": self._max_overflow,
+            "checked_out": checked_out,
+            "idle": self.checkedin(),
+            # QueuePool counts overflow from -pool_size while the pool fills.
+            "overflow": max(0, self.overflow()),
+            "utilization": round(checked_out / capacity, 3) if capacity else None,
+            "checkouts": self.checkouts,
+            "timeouts": self.timeouts,
+            "wait_seconds_total": round(self.wait_seconds_total, 6),
+            "wait_seconds_max": round(self.wait_seconds_max, 6),
+        }
+
+
+if settings.db_pgbouncer:
+    # PgBouncer in transaction mode hands each transaction a different server
+    # connection: statement names must be unique across clients, and pooling
+    # is left to PgBouncer (configure it to DISCARD ALL on release so the
+    # prepared statements do not pile up).
+    engine = create_async_engine(
+        settings.database_url,
+        echo=not settings.is_production,
+        poolclass=NullPool,
+        connect_args={
+            "prepared_statement_cache_size": 0,
+            "prepared_statement_name_func": lambda: f"__asyncpg_{uuid.uuid4()}__",
+        },
+    )
+else:
+    engine = create_async_engine(
+        settings.database_url,
+        echo=not settings.is_production,
+        poolclass=InstrumentedPool,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout_seconds,
+        pool_recycle=settings.db_pool_recycle_seconds,
+        connect_args={"prepared_statement_cache_size": settings.db_statement_cache_size},
+    )
 
 async_session_factory = async_sessionmaker(
     engine,
@@ -31,3 +103,17 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
             raise
         finally:
             await session.close()
+
+
+async def run_pool_liveness_checks() -> None:
+    """Ping the database every db_liveness_interval_seconds in place of a
+    pre-ping on every checkout. A ping that fails with a disconnect makes
+    SQLAlchemy invalidate the whole pool, so connections left over from a
+    restarted server are replaced before requests check them out."""
+    while True:
+        await asyncio.sleep(settings.db_liveness_interval_seconds)
+        try:
+            async with engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+        except Exception as e:
+            logger.warning("Database liveness check failed: %s", e)
@@ -20,7 +20,7 @@ async def require_admin(
             detail="Missing authorization header",
         )
     try:
-        return verify_firebase_token(creds.credentials)
+        return await verify_firebase_token(creds.credentials)
     except Exception:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -1,13 +1,15 @@
 from typing import Optional
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import APIKeyHeader
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.config import settings
 from app.database import get_db
 from app.models.api_key import ApiKey
 from app.schemas.common import ErrorDetail, ErrorResponse
-from app.services.auth_service import get_api_key_by_header, update_last_used
+from app.services.auth_service import get_api_key_by_header, record_last_used
+from app.services.rate_limiter import check_rate_limit, rate_limit_headers
 
 _api_key_header = APIKeyHeader(name="X-API-Key", scheme_name="apiKeyAuth", auto_error=False)
 
@@ -22,6 +24,7 @@ def _unauthorized(code: str, message: str) -> HTTPException:
 
 
 async def require_api_key(
+    request: Request,
     x_api_key: Optional[str] = Depends(_api_key_header),
     db: AsyncSession = Depends(get_db),
 ) -> ApiKey:
@@ -30,10 +33,33 @@ async def require_api_key(
     api_key = await get_api_key_by_header(db, x_api_key)
     if api_key is None:
         raise _unauthorized("INVALID_API_KEY", "Invalid or inactive API key")
-    await update_last_used(db, api_key)
+    if settings.rate_limit_enabled:
+        await _admit(api_key, request)
+    record_last_used(api_key)
     return api_key
 
 
+async def _admit(api_key: ApiKey, request: Request) -> None:
+    """Token-bucket admission control against ApiKey.rate_limit (no DB access).
+    RateLimitHeadersMiddleware adds the headers to whatever response follows."""
+    decision = await check_rate_limit(api_key.id, api_key.rate_limit)
+    headers = rate_limit_headers(decision)
+    request.state.rate_limit_headers = headers
+    if not decision.allowed:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=ErrorResponse(
+                error=ErrorDetail(
+                    code="RATE_LIMITED",
+                    message=f"Rate limit of {decision.limit} requests per "
+                    f"{settings.rate_limit_window_seconds}s exceeded",
+                    status=429,
+                )
+            ).model_dump(),
+            headers=headers,
+        )
+
+
 def require_tier(*allowed: str):
     """Dependency factory that checks API key tier."""
 
@@ -1,4 +1,5 @@
-from contextlib import asynccontextmanager
+import asyncio
+from contextlib import asynccontextmanager, suppress
 
 from fastapi import FastAPI, HTTPException, Request
 from fastapi.exceptions import RequestValidationError
@@ -7,8 +8,15 @@ from fastapi.openapi.utils import get_openapi
 from fastapi.responses import JSONResponse, PlainTextResponse
 
 from app.config import settings
+from app.database import run_pool_liveness_checks
+from app.middleware import CompressionMiddleware, RateLimitHeadersMiddleware
 from app.routers import admin, auth, events
 from app.schemas.common import ErrorDetail, ErrorResponse
+from app.services.admin_auth_service import run_firebase_key_refresher
+from app.services.auth_service import flush_last_used, run_last_used_flusher
+from app.services.event_service import run_tombstone_pruner
+from app.services.event_stream import run_change_listener
+from app.services.purge_service import run_purge_worker
 
 
 def error_response(code: str, message: str, status: int) -> dict:
@@ -17,7 +25,24 @@ def error_response(code: str, message: str, status: int) -> dict:
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    background = [
+        asyncio.create_task(run_last_used_flusher()),
+        asyncio.create_task(run_purge_worker()),
+        asyncio.create_task(run_firebase_key_refresher()),
+    ]
+    if settings.tombstone_retention_days > 0:
+        background.append(asyncio.create_task(run_tombstone_pruner()))
+    if settings.live_updates_enabled:
+        background.append(asyncio.create_task(run_change_listener()))
+    if settings.db_liveness_interval_seconds > 0 and not settings.db_pgbouncer:
+        background.append(asyncio.create_task(run_pool_liveness_checks()))
     yield
+    for task in background:
+        task.cancel()
+    for task in background:
+        with suppress(asyncio.CancelledError):
+            await task
+    await flush_last_used()
 
 
 async def http_exception_handler(request: Request, exc: HTTPException):
@@ -54,12 +79,21 @@ app = FastAPI(
 app.add_exception_handler(HTTPException, http_exception_handler)
 app.add_exception_handler(RequestValidationError, validation_exception_handler)
 
+app.add_middleware(RateLimitHeadersMiddleware)
+if settings.compression_enabled:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.compression_min_bytes,
+        level=settings.compression_level,
+    )
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=settings.effective_cors_origins,
     allow_credentials=True,
     allow_methods=["GET", "POST", "PATCH", "DELETE", "OPTIONS"],
     allow_headers=["Content-Type", "X-API-Key", "Authorization"],
+    expose_headers=["Retry-After", "X-RateLimit-Limit", "X-RateLimit-Remaining", "X-RateLimit-Reset"],
 )
 
 app.include_router(auth.router, prefix="/v1/auth", tags=["auth"])
@@ -78,8 +112,15 @@ async def root():
         "register": "POST /v1/auth/register",
         "endpoints": [
             "GET    /v1/events/nearby",
+            "GET    /v1/events/changes",
+            "GET    /v1/events/stream",
+            "GET    /v1/events/export",
+            "GET    /v1/events?ids=...",
             "GET    /v1/events/{event_id}",
             "POST   /v1/events",
+            "POST   /v1/events/batch",
+            "PATCH  /v1/events/batch",
+            "DELETE /v1/events/batch",
             "PATCH  /v1/events/{event_id}",
             "DELETE /v1/events/{event_id}",
         ],
@@ -108,9 +149,34 @@ async def llms_txt():
         "GET    /v1/events/nearby       — find events by lat/lng/radius with optional filters\n"
         "  Optional filters: event_type (list), audience (list), starts_after, starts_before\n"
         "  Pagination: limit (1–100, default 30), cursor (opaque, from next_cursor)\n"
-        "  Returns events ordered by start_at, with count, total, and next_cursor fields\n"
+        "  Ordering: sort=start_at (default) or sort=distance (closest first)\n"
+        "  Without radius: the nearest events at any distance, ordered by distance (total is null)\n"
+        "  Totals: include_total (default: first page of radius queries only; cursor pages repeat it),\n"
+        "          total_mode=exact|estimate (planner estimate, flagged by total_estimated)\n"
+        "  Returns events in that order, with count, total, and next_cursor fields\n"
+        "  Each event carries distance_miles (great-circle distance from lat/lng)\n"
+        "  fields=event_id,title,start_at,lat,lng: return only these event fields (also on GET by id)\n"
+        "GET    /v1/events/changes     — incremental sync: creates, updates and deletes since a cursor\n"
+        "  First call: updated_since=<ISO 8601> (or nothing for everything); then cursor=<next_cursor>\n"
+        "  Each change: {type: upsert|delete, event_id, changed_at, event}; has_more=false means caught up\n"
+        "  Changes appear once concurrent writes have committed (a few seconds' settle delay)\n"
+        "  Cursors older than the delete history (30 days by default) are rejected: sync again from the start\n"
+        "GET    /v1/events/stream      — live Server-Sent Events for lat/lng/radius (+ event_type, audience)\n"
+        "  Events: create | update (data: event with distance_miles), delete (data: {event_id}),\n"
+        "  reset (changes may have been missed: re-query /nearby). Comment heartbeats keep it open\n"
+        "GET    /v1/events/export      — stream all matching events as NDJSON, ordered by start_at\n"
+        "  Same filters as nearby; lat/lng/radius optional. Lines: {\"cursor\": ..., \"event\": {...}}\n"
+        "  Resume an interrupted export with cursor=<last line's cursor>\n"
+        "GET    /v1/events?ids=A,B     — get up to 200 events by ULID in one call (fields= supported)\n"
+        "  Returns events in request order plus missing (ids that do not exist)\n"
         "GET    /v1/events/{id}        — get single event by ULID\n"
         "POST   /v1/events             — create event (readwrite tier)\n"
+        "POST   /v1/events/batch       — create up to 500 events: {\"events\": [...]} (readwrite tier)\n"
+        "  Per-item results in order: created | updated | duplicate (existing event_id) | error\n"
+        "PATCH  /v1/events/batch       — update many events: {\"event_ids\": [...] or \"filter\": {...}, \"changes\": {...}}\n"
+        "DELETE /v1/events/batch       — delete many events: {\"event_ids\": [...]} or {\"filter\": {...}}\n"
+        "  Up to 500 ids; filter (event_type, audience, title, starts_after, starts_before) matches only your events and needs at least one criterion\n"
+        "  Returns updated/deleted ids and not_found ids (missing or not yours)\n"
         "PATCH  /v1/events/{id}        — update event (readwrite tier, owner only)\n"
         "DELETE /v1/events/{id}        — delete event (readwrite tier, owner only)\n"
         "\n"
@@ -119,6 +185,18 @@ async def llms_txt():
         "  agent_id + title + start_at + lat + lng\n"
         "If the same agent retries with the same tuple, API returns the existing event\n"
         "(same event_id) with 200. If any field in that tuple changes, a new event is created.\n"
+        "Add ?on_duplicate=update to overwrite the existing event's other fields instead;\n"
+        "it only counts as an update (and bumps updated_at) if one of them differs.\n"
+        "\n"
+        "## Response formats\n"
+        "Event reads (nearby, by id, ?ids=, export) are JSON by default, or MessagePack with\n"
+        "Accept: application/msgpack (export: consecutive MessagePack maps instead of NDJSON lines).\n"
+        "Responses are compressed when Accept-Encoding allows gzip (or br).\n"
+        "\n"
+        "## Rate limits\n"
+        "Each key may make rate_limit requests per hour (see registration response).\n"
+        "Responses carry X-RateLimit-Limit, X-RateLimit-Remaining and X-RateLimit-Reset.\n"
+        "Over the limit: 429 RATE_LIMITED with a Retry-After header (seconds).\n"
     )
 
 
@@ -225,16 +303,20 @@ async def for_agents():
                 "query_params": {
                     "lat": "required — latitude",
                     "lng": "required — longitude",
-                    "radius": "optional — miles (0.1–100). Omit for any distance",
+                    "radius": "optional — miles (0.1–100). Omit for the nearest events at any distance, closest first (total is then null)",
                     "event_type": "optional — repeat for multiple (e.g. event_type=meetup&event_type=talk). Omit for all types",
                     "audience": "optional — repeat for multiple (kids, adults, all). Omit for all audiences",
                     "starts_after": "optional — ISO 8601 datetime, inclusive (>=). Ended events are always excluded",
                     "starts_before": "optional — ISO 8601 datetime, exclusive (<)",
                     "limit": "optional — page size (1–100, default 30)",
                     "cursor": "optional — opaque cursor from a previous response's next_cursor. Omit for first page",
+                    "include_total": "optional — true/false. Defaults to true on the first page of a radius query and false otherwise; later pages repeat the first page's total",
+                    "total_mode": "optional — exact (default) or estimate (fast query-planner estimate; total_estimated=true)",
+                    "sort": "optional — start_at (default with radius) or distance (closest first; default and only option without radius). Keep the same sort when paging",
+                    "fields": "optional — comma-separated event fields to return (e.g. event_id,title,start_at,lat,lng,distance_miles); event_id is always included. Omit for all fields",
                 },
                 "request_body": None,
-                "response_notes": "Returns events ordered by start_at. count = events returned, total = all matching events. Pass next_cursor to fetch the next page; null means no more results.",
+                "response_notes": "Returns events ordered by start_at (or by distance with sort=distance). Each event includes distance_miles from lat/lng; with radius, only events within that great-circle distance are returned. count = events returned, total = all matching events. Pass next_cursor to fetch the next page; null means no more results.",
                 "response_example": {
                     "events": [
                         {
@@ -254,6 +336,7 @@ async def for_agents():
                             "audience": "adults",
                             "event_type": "meetup",
                             "created_at": "2026-03-01T12:00:00Z",
+                            "distance_miles": 0.0,
                         },
                         {
                             "event_id": "01JAQRS5678901234MNOPQRST",
@@ -272,10 +355,12 @@ async def for_agents():
                             "audience": "all",
                             "event_type": "market",
                             "created_at": "2026-03-02T09:30:00Z",
+                            "distance_miles": 2.019,
                         },
                     ],
                     "count": 2,
                     "total": 45,
+                    "total_estimated": False,
                     "next_cursor": "MjAyNi0wMy0xNlQwODowMDowMCswMDowMHwwMUpBUVJTNTY3ODkwMTIzNE1OT1BRUlNU",
                 },
             },
@@ -342,7 +427,9 @@ async def for_agents():
             "key": "agent_id + title + start_at + lat + lng",
             "behavior": "If the same agent sends a create request matching all five fields of an existing event, "
                         "the API returns the existing event (same event_id) with 200. "
-                        "No duplicate is created. If any field in the tuple differs, a new event is created.",
+                        "No duplicate is created. If any field in the tuple differs, a new event is created. "
+                        "Pass ?on_duplicate=update to refresh the existing event's other fields from the request instead; "
+                        "an event whose fields already match is left unchanged.",
         },
         "error_codes": [
             {
@@ -363,6 +450,18 @@ async def for_agents():
                 "when": "The API key's tier does not permit this operation (e.g. read-only key on a write endpoint).",
                 "agent_action": "Register a new key with the required tier, or contact the API operator.",
             },
+            {
+                "code": "RATE_LIMITED",
+                "status": 429,
+                "when": "The API key has used up its rate_limit (requests per hour).",
+                "agent_action": "Wait the number of seconds in the Retry-After header. X-RateLimit-Remaining shows the remaining budget.",
+            },
+            {
+                "code": "STREAM_UNAVAILABLE",
+                "status": 503,
+                "when": "GET /v1/events/stream cannot take more subscribers right now, or live updates are down.",
+                "agent_action": "Retry after a short delay, or poll /v1/events/nearby meanwhile.",
+            },
             {
                 "code": "NOT_FOUND",
                 "status": 404,
@@ -1,5 +1,7 @@
 from app.models.base import Base
 from app.models.api_key import ApiKey
 from app.models.event import Event
+from app.models.event_tombstone import EventTombstone
+from app.models.purge_job import PurgeJob
 
-__all__ = ["Base", "ApiKey", "Event"]
+__all__ = ["Base", "ApiKey", "Event", "EventTombstone", "PurgeJob"]
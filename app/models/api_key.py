@@ -20,6 +20,8 @@ class ApiKey(Base):
     tier: Mapped[str] = mapped_column(String(32), nullable=False, default="read")
     rate_limit: Mapped[int] = mapped_column(Integer, nullable=False, default=50)
     is_active: Mapped[bool] = mapped_column(Boolean, nullable=False, default=True)
+    # Maintained by the event create and delete paths (see event_service).
+    event_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now()
     )
@@ -0,0 +1,23 @@
+import uuid
+from datetime import datetime
+
+from sqlalchemy import DateTime, Double, String
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base
+
+
+class EventTombstone(Base):
+    """Record of a deleted event, kept so the changes feed can report deletes.
+
+    No foreign key on agent_id: tombstones outlive the agent's key.
+    """
+
+    __tablename__ = "event_tombstones"
+
+    event_id: Mapped[str] = mapped_column(String(26), primary_key=True)  # ULID
+    agent_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), nullable=False)
+    lat: Mapped[float] = mapped_column(Double, nullable=False)
+    lng: Mapped[float] = mapped_column(Double, nullable=False)
+    deleted_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
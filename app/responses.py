@@ -0,0 +1,86 @@
+"""Response encoding for event reads: JSON by default, MessagePack when the
+client's Accept header prefers it. The format is chosen once per request and
+kept on request.state, so every route encodes the same way."""
+from typing import AsyncIterator, List, Optional
+
+from fastapi import Request, Response
+from fastapi.responses import StreamingResponse
+from pydantic import TypeAdapter
+
+from app.schemas.event import ExportItemDict, export_item_json
+
+try:
+    import msgpack
+except ImportError:  # optional: without it every response is JSON
+    msgpack = None
+
+JSON = "application/json"
+NDJSON = "application/x-ndjson"
+MSGPACK = "application/msgpack"
+_MSGPACK_TYPES = (MSGPACK, "application/x-msgpack")
+
+
+def _accept_quality(accept: str, media_types) -> Optional[float]:
+    """Highest q the Accept header gives any of ``media_types`` (None if unlisted)."""
+    best: Optional[float] = None
+    for part in accept.split(","):
+        media_type, *params = [p.strip() for p in part.split(";")]
+        if media_type.lower() not in media_types:
+            continue
+        q = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        best = q if best is None else max(best, q)
+    return best
+
+
+def response_format(request: Request) -> str:
+    """MSGPACK if msgpack is installed and Accept ranks it at least as high as
+    JSON (or omits JSON); JSON otherwise."""
+    fmt = getattr(request.state, "response_format", None)
+    if fmt is None:
+        fmt = JSON
+        accept = request.headers.get("accept")
+        if msgpack is not None and accept:
+            q_msgpack = _accept_quality(accept, _MSGPACK_TYPES)
+            if q_msgpack:
+                q_json = _accept_quality(accept, (JSON, NDJSON))
+                if q_json is None or q_msgpack >= q_json:
+                    fmt = MSGPACK
+        request.state.response_format = fmt
+    return fmt
+
+
+def encode(request: Request, adapter: TypeAdapter, payload) -> Response:
+    """Serialise a read result straight to bytes in the negotiated format.
+
+    The route's response_model documents the shape but is not applied: the
+    payload is plain dicts from the database, so re-validating it would only
+    cost time, and fields= projections would not pass it.
+    """
+    if response_format(request) == MSGPACK:
+        content = msgpack.packb(adapter.dump_python(payload, mode="json"))
+        return Response(content, media_type=MSGPACK, headers={"Vary": "Accept"})
+    return Response(adapter.dump_json(payload), media_type=JSON, headers={"Vary": "Accept"})
+
+
+def encode_export(request: Request, batches: AsyncIterator[List[ExportItemDict]]) -> StreamingResponse:
+    """NDJSON (one item per line), or a sequence of MessagePack maps."""
+    if response_format(request) == MSGPACK:
+
+        async def body():
+            async for batch in batches:
+                yield b"".join(msgpack.packb(export_item_json.dump_python(item, mode="json")) for item in batch)
+
+        return StreamingResponse(body(), media_type=MSGPACK, headers={"Vary": "Accept"})
+
+    async def body():
+        async for batch in batches:
+            yield b"".join(export_item_json.dump_json(item) + b"\n" for item in batch)
+
+    return StreamingResponse(body(), media_type=NDJSON, headers={"Vary": "Accept"})
@@ -1,21 +1,36 @@
+from typing import Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy import func, select
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Request, status
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
+from app.database import InstrumentedPool, engine, get_db
 from app.dependencies.admin_auth import require_admin
 from app.models.api_key import ApiKey
-from app.models.event import Event
+from app.models.purge_job import PurgeJob
+from app.responses import encode
 from app.schemas.admin import (
     AdminUserResponse,
     AgentEventsResponse,
     AgentListResponse,
     AgentSummary,
+    CacheStats,
+    MetricsResponse,
+    PoolStats,
+    PurgeJobResponse,
+    agent_events_json,
 )
-from app.schemas.event import EventResponse
-from app.services.event_service import delete_event, delete_events_by_agent
+from app.services.admin_auth_service import verified_token_cache
+from app.services.auth_service import list_api_keys, verified_key_cache
+from app.services.event_service import (
+    AGENT_EVENTS_LIMIT_DEFAULT,
+    AGENT_EVENTS_LIMIT_MAX,
+    delete_event,
+    get_events_by_agent,
+    nearby_cache,
+)
+from app.services.purge_service import get_purge_job, start_purge, wake_purge_worker
 
 router = APIRouter()
 
@@ -30,100 +45,88 @@ async def admin_me(user: dict = Depends(require_admin)):
     )
 
 
+@router.get("/metrics", response_model=MetricsResponse)
+async def admin_metrics(_user: dict = Depends(require_admin)):
+    """Hit/miss counters for this worker's in-process caches, and its
+    connection pool's occupancy and checkout wait times."""
+    return MetricsResponse(
+        caches={
+            "api_keys": CacheStats(**verified_key_cache.stats()),
+            "admin_tokens": CacheStats(**verified_token_cache.stats()),
+            "nearby": CacheStats(**nearby_cache.stats()),
+        },
+        pool=PoolStats(**engine.pool.stats()) if isinstance(engine.pool, InstrumentedPool) else None,
+    )
+
+
+AGENTS_LIMIT_DEFAULT = 50
+AGENTS_LIMIT_MAX = 200
+
+
+def _agent_summary(agent: ApiKey) -> AgentSummary:
+    return AgentSummary(
+        id=agent.id,
+        email=agent.email,
+        agent_name=agent.agent_name,
+        tier=agent.tier,
+        is_active=agent.is_active,
+        created_at=agent.created_at,
+        last_used_at=agent.last_used_at,
+        event_count=agent.event_count,
+    )
+
+
 @router.get("/agents", response_model=AgentListResponse)
 async def list_agents(
+    limit: int = Query(AGENTS_LIMIT_DEFAULT, ge=1, le=AGENTS_LIMIT_MAX),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    search: Optional[str] = Query(
+        None, min_length=1, max_length=255, description="Case-insensitive substring of email or agent name"
+    ),
     _user: dict = Depends(require_admin),
     db: AsyncSession = Depends(get_db),
 ):
-    event_count_subq = (
-        select(
-            Event.agent_id,
-            func.count(Event.event_id).label("event_count"),
-        )
-        .group_by(Event.agent_id)
-        .subquery()
+    """API keys, newest first, one keyset page at a time. event_count is the
+    maintained api_keys.event_count, so no page touches the events table."""
+    try:
+        agents, total, next_cursor = await list_api_keys(db, limit, cursor, search)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    return AgentListResponse(
+        agents=[_agent_summary(a) for a in agents],
+        total=total,
+        next_cursor=next_cursor,
     )
 
-    stmt = (
-        select(ApiKey, func.coalesce(event_count_subq.c.event_count, 0).label("event_count"))
-        .outerjoin(event_count_subq, ApiKey.id == event_count_subq.c.agent_id)
-        .order_by(ApiKey.created_at.desc())
-    )
-
-    result = await db.execute(stmt)
-    rows = result.all()
-
-    agents = [
-        AgentSummary(
-            id=row.ApiKey.id,
-            email=row.ApiKey.email,
-            agent_name=row.ApiKey.agent_name,
-            tier=row.ApiKey.tier,
-            is_active=row.ApiKey.is_active,
-            created_at=row.ApiKey.created_at,
-            last_used_at=row.ApiKey.last_used_at,
-            event_count=row.event_count,
-        )
-        for row in rows
-    ]
-
-    return AgentListResponse(agents=agents, total=len(agents))
-
 
 @router.get("/agents/{agent_id}/events", response_model=AgentEventsResponse)
 async def get_agent_events(
     agent_id: UUID,
+    request: Request,
+    limit: int = Query(AGENT_EVENTS_LIMIT_DEFAULT, ge=1, le=AGENT_EVENTS_LIMIT_MAX),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
     _user: dict = Depends(require_admin),
     db: AsyncSession = Depends(get_db),
 ):
+    """One page of the agent's events, newest first. agent.event_count is the
+    agent's total, not the page size."""
     agent_result = await db.execute(select(ApiKey).where(ApiKey.id == agent_id))
     agent = agent_result.scalar_one_or_none()
     if agent is None:
         raise HTTPException(status_code=404, detail="Agent not found")
 
-    events_result = await db.execute(
-        select(Event)
-        .where(Event.agent_id == agent_id)
-        .order_by(Event.created_at.desc())
-    )
-    events = events_result.scalars().all()
+    try:
+        events, next_cursor = await get_events_by_agent(db, agent_id, limit, cursor)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
 
-    event_count = len(events)
-    agent_summary = AgentSummary(
-        id=agent.id,
-        email=agent.email,
-        agent_name=agent.agent_name,
-        tier=agent.tier,
-        is_active=agent.is_active,
-        created_at=agent.created_at,
-        last_used_at=agent.last_used_at,
-        event_count=event_count,
+    return encode(
+        request,
+        agent_events_json,
+        {"agent": _agent_summary(agent), "events": events, "next_cursor": next_cursor},
     )
 
-    event_responses = [
-        EventResponse(
-            event_id=e.event_id,
-            agent_id=str(e.agent_id),
-            title=e.title,
-            description=e.description,
-            start_at=e.start_at,
-            end_at=e.end_at,
-            timezone=e.timezone,
-            location_name=e.location_name,
-            address=e.address,
-            lat=e.lat,
-            lng=e.lng,
-            url=e.url,
-            cost=e.cost,
-            audience=e.audience,
-            event_type=e.event_type,
-            created_at=e.created_at,
-        )
-        for e in events
-    ]
-
-    return AgentEventsResponse(agent=agent_summary, events=event_responses)
-
 
 @router.delete(
     "/events/{event_id}",
@@ -139,34 +142,74 @@ async def admin_delete_event(
         raise HTTPException(status_code=404, detail="Event not found")
 
 
+def _purge_job_response(job: PurgeJob) -> PurgeJobResponse:
+    return PurgeJobResponse(
+        id=job.id,
+        agent_id=job.agent_id,
+        delete_agent=job.delete_agent,
+        status=job.status,
+        total=job.total,
+        deleted=job.deleted,
+        error=job.error,
+        created_at=job.created_at,
+        updated_at=job.updated_at,
+        finished_at=job.finished_at,
+    )
+
+
+async def _queue_purge(
+    db: AsyncSession, agent_id: UUID, delete_agent: bool, background_tasks: BackgroundTasks
+) -> PurgeJobResponse:
+    agent_result = await db.execute(select(ApiKey).where(ApiKey.id == agent_id))
+    agent = agent_result.scalar_one_or_none()
+    if agent is None:
+        raise HTTPException(status_code=404, detail="Agent not found")
+    job = await start_purge(db, agent, delete_agent)
+    # Background tasks run after the request's transaction has committed.
+    background_tasks.add_task(wake_purge_worker)
+    return _purge_job_response(job)
+
+
 @router.delete(
     "/agents/{agent_id}/events",
-    status_code=status.HTTP_204_NO_CONTENT,
+    response_model=PurgeJobResponse,
+    status_code=status.HTTP_202_ACCEPTED,
 )
 async def admin_delete_agent_events(
     agent_id: UUID,
+    background_tasks: BackgroundTasks,
     _user: dict = Depends(require_admin),
     db: AsyncSession = Depends(get_db),
 ):
-    agent_result = await db.execute(select(ApiKey).where(ApiKey.id == agent_id))
-    if agent_result.scalar_one_or_none() is None:
-        raise HTTPException(status_code=404, detail="Agent not found")
-    await delete_events_by_agent(db, agent_id)
+    """Delete the agent's events in the background. The key keeps working;
+    events it creates after the purge starts are kept."""
+    return await _queue_purge(db, agent_id, False, background_tasks)
 
 
 @router.delete(
     "/agents/{agent_id}",
-    status_code=status.HTTP_204_NO_CONTENT,
+    response_model=PurgeJobResponse,
+    status_code=status.HTTP_202_ACCEPTED,
 )
 async def admin_delete_agent(
     agent_id: UUID,
+    background_tasks: BackgroundTasks,
     _user: dict = Depends(require_admin),
     db: AsyncSession = Depends(get_db),
 ):
-    agent_result = await db.execute(select(ApiKey).where(ApiKey.id == agent_id))
-    agent = agent_result.scalar_one_or_none()
-    if agent is None:
-        raise HTTPException(status_code=404, detail="Agent not found")
-    await delete_events_by_agent(db, agent_id)
-    await db.delete(agent)
-    await db.flush()
+    """Deactivate the key now; its events and then the key itself are
+    deleted in the background. If the purge fails the key is reactivated
+    (if it was active)."""
+    return await _queue_purge(db, agent_id, True, background_tasks)
+
+
+@router.get("/jobs/{job_id}", response_model=PurgeJobResponse)
+async def get_job(
+    job_id: UUID,
+    _user: dict = Depends(require_admin),
+    db: AsyncSession = Depends(get_db),
+):
+    job = await get_purge_job(db, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return _purge_job_response(job)
@@ -1,67 +1,247 @@
 from datetime import datetime
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_db
 from app.dependencies.auth import require_api_key, require_tier
 from app.models.api_key import ApiKey
+from app.responses import MSGPACK, NDJSON, encode, encode_export
 from app.schemas.common import ErrorDetail, ErrorResponse
-from app.schemas.event import Audience, EventCreate, EventResponse, EventType, EventsNearbyResponse, EventUpdate
-from app.services.event_service import create_event, delete_event, get_event_by_id, get_events_nearby, update_event
+from app.schemas.event import (
+    EVENT_FIELDS,
+    Audience,
+    BatchItemStatus,
+    EventBatchCreate,
+    EventBatchCreateResponse,
+    EventBatchDelete,
+    EventBatchDeleteResponse,
+    EventBatchItemResult,
+    EventBatchUpdate,
+    EventBatchUpdateResponse,
+    EventChangesResponse,
+    EventCreate,
+    EVENT_IDS_MAX,
+    EventResponse,
+    EventType,
+    EventsByIdResponse,
+    EventsNearbyResponse,
+    EventUpdate,
+    NearbySort,
+    OnDuplicate,
+    TotalMode,
+    event_json,
+    events_by_id_json,
+    events_nearby_json,
+)
+from app.services.event_service import (
+    create_event,
+    create_events_batch,
+    delete_event,
+    delete_events_batch,
+    export_events,
+    get_event_by_id,
+    get_event_changes,
+    get_events_by_ids,
+    get_events_nearby,
+    update_event,
+    update_events_batch,
+)
+from app.services.event_stream import Subscription, change_hub
 
 router = APIRouter()
 
 RADIUS_MIN = 0.1
 RADIUS_MAX = 100.0
 
+# Same body as MessagePack for clients sending Accept: application/msgpack.
+MSGPACK_RESPONSE = {200: {"content": {MSGPACK: {}}}}
+
+FIELDS_DESCRIPTION = (
+    "Comma-separated event fields to return, e.g. event_id,title,start_at,lat,lng,distance_miles. "
+    "event_id is always included. Omit for all fields."
+)
+
 
 @router.get(
     "/nearby",
     response_model=EventsNearbyResponse,
+    responses=MSGPACK_RESPONSE,
     summary="Find events by location",
-    response_description="Paginated events matching the filters, ordered by start_at. Use next_cursor to fetch subsequent pages.",
+    response_description="Paginated events matching the filters, ordered by start_at (default) or distance. Use next_cursor to fetch subsequent pages.",
 )
 async def nearby(
+    request: Request,
     lat: float = Query(..., ge=-90, le=90, description="Latitude"),
     lng: float = Query(..., ge=-180, le=180, description="Longitude"),
-    radius: Optional[float] = Query(None, ge=RADIUS_MIN, le=RADIUS_MAX, description="Radius in miles. Omit for all events."),
+    radius: Optional[float] = Query(None, ge=RADIUS_MIN, le=RADIUS_MAX, description="Radius in miles. Omit for the nearest events at any distance, ordered by distance (total is then null)."),
     event_type: Optional[List[EventType]] = Query(None, description="Filter by event type(s). Omit for all types."),
     audience: Optional[List[Audience]] = Query(None, description="Filter by audience(s). Omit for all audiences."),
     starts_after: Optional[datetime] = Query(None, description="Only events starting at or after this time (inclusive, ISO 8601). Ended events are always excluded."),
     starts_before: Optional[datetime] = Query(None, description="Only events starting before this time (exclusive, ISO 8601)."),
     limit: int = Query(30, ge=1, le=100, description="Page size (1–100, default 30)."),
     cursor: Optional[str] = Query(None, description="Cursor from a previous response's next_cursor. Omit for first page."),
+    sort: Optional[NearbySort] = Query(None, description="start_at or distance (closest first). Defaults to start_at with radius and distance without; start_at requires radius. A cursor only continues the sort it was issued for."),
+    include_total: Optional[bool] = Query(None, description="Count all matching events. Defaults to true on the first page of a radius query; cursor pages repeat the first page's total."),
+    total_mode: TotalMode = Query(TotalMode.EXACT, description="exact (count) or estimate (query-planner estimate, much cheaper on large result sets)."),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
     db: AsyncSession = Depends(get_db),
     api_key: ApiKey = Depends(require_api_key),
 ):
+    field_names = _parse_fields(fields)
     event_type_values = [e.value for e in event_type] if event_type else None
     audience_values = [a.value for a in audience] if audience else None
-    events, count, total, next_cursor = await get_events_nearby(
-        db, lat, lng, radius,
-        event_types=event_type_values,
-        audiences=audience_values,
-        starts_after=starts_after,
-        starts_before=starts_before,
-        limit=limit,
-        cursor=cursor,
+    try:
+        result = await get_events_nearby(
+            db, lat, lng, radius,
+            event_types=event_type_values,
+            audiences=audience_values,
+            starts_after=starts_after,
+            starts_before=starts_before,
+            limit=limit,
+            cursor=cursor,
+            sort=sort.value if sort else None,
+            include_total=include_total,
+            total_mode=total_mode.value,
+            fields=field_names,
+        )
+    except ValueError as e:
+        raise _validation_error(str(e))
+    return encode(request, events_nearby_json, result)
+
+
+@router.get(
+    "/changes",
+    response_model=EventChangesResponse,
+    summary="Feed of event changes",
+    response_description="Creates/updates (upsert, with the current event) and deletes, oldest first. Poll with next_cursor to stay in sync.",
+)
+async def changes(
+    cursor: Optional[str] = Query(None, description="next_cursor from a previous response."),
+    updated_since: Optional[datetime] = Query(None, description="Start at changes from this time (inclusive, ISO 8601) when there is no cursor. Omit both for a full sync from the beginning."),
+    limit: int = Query(100, ge=1, le=1000, description="Page size (1–1000, default 100)."),
+    db: AsyncSession = Depends(get_db),
+    api_key: ApiKey = Depends(require_api_key),
+):
+    try:
+        return await get_event_changes(db, cursor=cursor, updated_since=updated_since, limit=limit)
+    except ValueError as e:
+        raise _validation_error(str(e))
+
+
+@router.get(
+    "/stream",
+    summary="Live changes in an area (Server-Sent Events)",
+    response_class=StreamingResponse,
+    responses={200: {"content": {"text/event-stream": {}}, "description": "create, update, delete and reset events as they happen."}},
+)
+async def stream(
+    lat: float = Query(..., ge=-90, le=90, description="Latitude"),
+    lng: float = Query(..., ge=-180, le=180, description="Longitude"),
+    radius: float = Query(..., ge=RADIUS_MIN, le=RADIUS_MAX, description="Radius in miles"),
+    event_type: Optional[List[EventType]] = Query(None, description="Filter by event type(s). Omit for all types."),
+    audience: Optional[List[Audience]] = Query(None, description="Filter by audience(s). Omit for all audiences."),
+    api_key: ApiKey = Depends(require_api_key),
+):
+    """Push creates, updates and deletes of events within radius instead of polling /nearby. Deletes (and events that move out of the area) carry only event_id. A reset event means changes may have been missed; re-query /nearby."""
+    if not change_hub.available():
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=ErrorResponse(
+                error=ErrorDetail(
+                    code="STREAM_UNAVAILABLE",
+                    message="Live updates are unavailable; retry shortly or poll /v1/events/nearby",
+                    status=503,
+                )
+            ).model_dump(),
+        )
+    sub = Subscription(
+        lat, lng, radius,
+        event_types=[e.value for e in event_type] if event_type else None,
+        audiences=[a.value for a in audience] if audience else None,
     )
-    return EventsNearbyResponse(events=events, count=count, total=total, next_cursor=next_cursor)
+    return StreamingResponse(
+        change_hub.sse(sub),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get(
+    "/export",
+    summary="Export events as NDJSON",
+    response_class=StreamingResponse,
+    responses={200: {"content": {NDJSON: {}, MSGPACK: {}}, "description": "One {\"cursor\", \"event\"} object per line (or consecutive MessagePack maps), ordered by start_at."}},
+)
+async def export(
+    request: Request,
+    lat: Optional[float] = Query(None, ge=-90, le=90, description="Latitude (with lng and radius to limit the export to an area)"),
+    lng: Optional[float] = Query(None, ge=-180, le=180, description="Longitude"),
+    radius: Optional[float] = Query(None, ge=RADIUS_MIN, le=RADIUS_MAX, description="Radius in miles"),
+    event_type: Optional[List[EventType]] = Query(None, description="Filter by event type(s). Omit for all types."),
+    audience: Optional[List[Audience]] = Query(None, description="Filter by audience(s). Omit for all audiences."),
+    starts_after: Optional[datetime] = Query(None, description="Only events starting at or after this time (inclusive, ISO 8601). Ended events are always excluded."),
+    starts_before: Optional[datetime] = Query(None, description="Only events starting before this time (exclusive, ISO 8601)."),
+    cursor: Optional[str] = Query(None, description="cursor of the last line received, to resume an interrupted export."),
+    api_key: ApiKey = Depends(require_api_key),
+):
+    """Stream every matching event without paging. Memory use is constant however large the export."""
+    try:
+        body = export_events(
+            lat, lng, radius,
+            event_types=[e.value for e in event_type] if event_type else None,
+            audiences=[a.value for a in audience] if audience else None,
+            starts_after=starts_after,
+            starts_before=starts_before,
+            cursor=cursor,
+        )
+    except ValueError as e:
+        raise _validation_error(str(e))
+    return encode_export(request, body)
+
+
+@router.get(
+    "",
+    response_model=EventsByIdResponse,
+    responses=MSGPACK_RESPONSE,
+    summary="Get events by ID",
+    response_description="Events in the order requested, plus the ids that were not found.",
+)
+async def get_many(
+    request: Request,
+    ids: List[str] = Query(..., description=f"Event ULIDs, repeated (ids=A&ids=B) or comma-separated (ids=A,B). Up to {EVENT_IDS_MAX}."),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    db: AsyncSession = Depends(get_db),
+    api_key: ApiKey = Depends(require_api_key),
+):
+    event_ids = [i for value in ids for i in value.split(",") if i]
+    if not event_ids:
+        raise _validation_error("ids: at least one event_id is required")
+    if len(event_ids) > EVENT_IDS_MAX:
+        raise _validation_error(f"ids: at most {EVENT_IDS_MAX} event_ids per request")
+    field_names = _parse_fields(fields)
+    return encode(request, events_by_id_json, await get_events_by_ids(db, event_ids, field_names))
 
 
 @router.get(
     "/{event_id}",
     response_model=EventResponse,
+    responses=MSGPACK_RESPONSE,
     summary="Get event by ID",
     response_description="Single event by ULID.",
 )
 async def get_event(
+    request: Request,
     event_id: str,
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
     db: AsyncSession = Depends(get_db),
     api_key: ApiKey = Depends(require_api_key),
 ):
-    event = await get_event_by_id(db, event_id)
+    field_names = _parse_fields(fields)
+    event = await get_event_by_id(db, event_id, field_names)
     if event is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -73,7 +253,7 @@ async def get_event(
                 )
             ).model_dump(),
         )
-    return event
+    return encode(request, event_json, event)
 
 
 @router.post(
@@ -84,10 +264,116 @@ async def get_event(
 )
 async def create(
     req: EventCreate,
+    on_duplicate: OnDuplicate = Query(OnDuplicate.RETURN, description="If this agent already has an event with the same title, start_at, lat and lng: return it unchanged (default) or update its other fields from this request."),
     db: AsyncSession = Depends(get_db),
     api_key: ApiKey = Depends(require_tier("readwrite")),
 ):
-    return await create_event(db, api_key.id, req)
+    return await create_event(db, api_key.id, req, on_duplicate=on_duplicate.value)
+
+
+@router.post(
+    "/batch",
+    response_model=EventBatchCreateResponse,
+    summary="Create events in bulk",
+    response_description="Per-item results in request order: created, updated, duplicate (with the existing event_id) or error. Requires readwrite tier.",
+)
+async def create_batch(
+    req: EventBatchCreate,
+    on_duplicate: OnDuplicate = Query(OnDuplicate.RETURN, description="Same as POST /v1/events: return existing events unchanged, or update them."),
+    db: AsyncSession = Depends(get_db),
+    api_key: ApiKey = Depends(require_tier("readwrite")),
+):
+    """Validate and insert up to 500 events in one transaction. Invalid items do not abort the batch. Idempotency is the same as POST /v1/events."""
+    results: List[Optional[EventBatchItemResult]] = [None] * len(req.events)
+    valid: List[EventCreate] = []
+    valid_index: List[int] = []
+    for i, raw in enumerate(req.events):
+        try:
+            valid.append(EventCreate.model_validate(raw))
+            valid_index.append(i)
+        except ValidationError as e:
+            results[i] = EventBatchItemResult(
+                index=i,
+                status=BatchItemStatus.ERROR,
+                error=ErrorDetail(code="VALIDATION_ERROR", message=_format_errors(e), status=422),
+            )
+
+    if valid:
+        outcomes = await create_events_batch(db, api_key.id, valid, on_duplicate=on_duplicate.value)
+        for i, (event_id, item_status) in zip(valid_index, outcomes):
+            results[i] = EventBatchItemResult(index=i, status=item_status, event_id=event_id)
+
+    return EventBatchCreateResponse(
+        results=results,
+        created=sum(r.status == BatchItemStatus.CREATED for r in results),
+        updated=sum(r.status == BatchItemStatus.UPDATED for r in results),
+        duplicates=sum(r.status == BatchItemStatus.DUPLICATE for r in results),
+        errors=sum(r.status == BatchItemStatus.ERROR for r in results),
+    )
+
+
+@router.patch(
+    "/batch",
+    response_model=EventBatchUpdateResponse,
+    summary="Update events in bulk",
+    response_description="Updated event_ids and requested ids that were not found. Requires readwrite tier.",
+)
+async def update_batch(
+    req: EventBatchUpdate,
+    db: AsyncSession = Depends(get_db),
+    api_key: ApiKey = Depends(require_tier("readwrite", "admin")),
+):
+    """Apply the same partial update to up to 500 events by id, or to all of your events matching a filter. All or nothing: if any event fails validation, none are changed."""
+    try:
+        return await update_events_batch(db, api_key.id, req, is_admin=api_key.tier == "admin")
+    except ValueError as e:
+        raise _validation_error(str(e))
+
+
+@router.delete(
+    "/batch",
+    response_model=EventBatchDeleteResponse,
+    summary="Delete events in bulk",
+    response_description="Deleted event_ids and requested ids that were not found. Requires readwrite tier.",
+)
+async def delete_batch(
+    req: EventBatchDelete,
+    db: AsyncSession = Depends(get_db),
+    api_key: ApiKey = Depends(require_tier("readwrite", "admin")),
+):
+    """Delete up to 500 events by id, or all of your events matching a filter."""
+    return await delete_events_batch(db, api_key.id, req, is_admin=api_key.tier == "admin")
+
+
+def _parse_fields(fields: Optional[str]) -> Optional[List[str]]:
+    if fields is None:
+        return None
+    names = [f.strip() for f in fields.split(",") if f.strip()]
+    unknown = [f for f in names if f not in EVENT_FIELDS]
+    if unknown:
+        raise _validation_error(
+            f"fields: unknown field(s) {', '.join(unknown)}; choose from {', '.join(EVENT_FIELDS)}"
+        )
+    return names or None
+
+
+def _format_errors(exc: ValidationError) -> str:
+    return "; ".join(
+        f"{e['loc'][-1]}: {e['msg']}" if e["loc"] else e["msg"] for e in exc.errors()
+    )
+
+
+def _validation_error(message: str) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+        detail=ErrorResponse(
+            error=ErrorDetail(
+                code="VALIDATION_ERROR",
+                message=message,
+                status=422,
+            )
+        ).model_dump(),
+    )
 
 
 def _not_found(event_id: str) -> HTTPException:
@@ -120,16 +406,7 @@ async def update(
             db, event_id, api_key.id, req, is_admin=api_key.tier == "admin"
         )
     except ValueError as e:
-        raise HTTPException(
-            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-            detail=ErrorResponse(
-                error=ErrorDetail(
-                    code="VALIDATION_ERROR",
-                    message=str(e),
-                    status=422,
-                )
-            ).model_dump(),
-        )
+        raise _validation_error(str(e))
     if result is None:
         raise _not_found(event_id)
     return result
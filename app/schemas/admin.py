@@ -1,10 +1,11 @@
 from datetime import datetime
-from typing import List, Optional
+from typing import Dict, List, Optional
 from uuid import UUID
 
-from pydantic import BaseModel
+from pydantic import BaseModel, TypeAdapter
+from typing_extensions import TypedDict
 
-from app.schemas.event import EventResponse
+from app.schemas.event import EventDict, EventResponse
 
 
 class AdminUserResponse(BaseModel):
@@ -26,9 +27,67 @@ class AgentSummary(BaseModel):
 
 class AgentListResponse(BaseModel):
     agents: List[AgentSummary]
-    total: int
+    total: int  # all keys matching the search, counted on the first page
+    next_cursor: Optional[str] = None
 
 
 class AgentEventsResponse(BaseModel):
     agent: AgentSummary
     events: List[EventResponse]
+    next_cursor: Optional[str] = None
+
+
+class AgentEventsDict(TypedDict):
+    """AgentEventsResponse as built by the route (see EventDict)."""
+
+    agent: AgentSummary
+    events: List[EventDict]
+    next_cursor: Optional[str]
+
+
+agent_events_json = TypeAdapter(AgentEventsDict)
+
+
+class PurgeJobResponse(BaseModel):
+    """A background purge. Poll GET /v1/admin/jobs/{id} until status is done
+    or failed; deleted counts up as batches commit."""
+
+    id: UUID
+    agent_id: UUID
+    delete_agent: bool
+    status: str
+    total: int
+    deleted: int
+    error: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
+    finished_at: Optional[datetime] = None
+
+
+class CacheStats(BaseModel):
+    size: int
+    max_size: int
+    ttl_seconds: float
+    hits: int
+    misses: int
+    evictions: int
+
+
+class PoolStats(BaseModel):
+    size: int
+    max_overflow: int
+    checked_out: int
+    idle: int
+    overflow: int
+    utilization: Optional[float] = None  # checked_out / (size + max_overflow)
+    checkouts: int
+    timeouts: int
+    wait_seconds_total: float
+    wait_seconds_max: float
+
+
+class MetricsResponse(BaseModel):
+    """Per-worker counters; each worker process reports only its own."""
+
+    caches: Dict[str, CacheStats]
+    pool: Optional[PoolStats] = None  # None without a client-side pool (db_pgbouncer)
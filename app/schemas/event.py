@@ -1,10 +1,16 @@
 from datetime import datetime, timezone
 from enum import Enum
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 from urllib.parse import urlparse
 from zoneinfo import ZoneInfo
 
-from pydantic import BaseModel, Field, field_validator, model_validator
+from pydantic import BaseModel, Field, TypeAdapter, field_validator, model_validator
+from typing_extensions import TypedDict
+
+from app.schemas.common import ErrorDetail
+
+EVENT_BATCH_MAX = 500
+EVENT_IDS_MAX = 200
 
 
 class Audience(str, Enum):
@@ -31,6 +37,21 @@ class EventType(str, Enum):
     CEREMONY = "ceremony"
 
 
+class NearbySort(str, Enum):
+    START_AT = "start_at"
+    DISTANCE = "distance"
+
+
+class OnDuplicate(str, Enum):
+    RETURN = "return"
+    UPDATE = "update"
+
+
+class TotalMode(str, Enum):
+    EXACT = "exact"
+    ESTIMATE = "estimate"
+
+
 class EventCreate(BaseModel):
     title: str = Field(..., min_length=1, max_length=200)
     description: Optional[str] = Field(None, max_length=10000)
@@ -176,6 +197,9 @@ class EventResponse(BaseModel):
     audience: str
     event_type: str
     created_at: datetime
+    distance_miles: Optional[float] = Field(
+        None, description="Great-circle distance from the query point in miles (nearby results only)"
+    )
 
     model_config = {
         "json_schema_extra": {
@@ -203,10 +227,18 @@ class EventResponse(BaseModel):
     }
 
 
+# Names accepted by the fields= projection parameter.
+EVENT_FIELDS = tuple(EventResponse.model_fields)
+
+
 class EventsNearbyResponse(BaseModel):
     events: List[EventResponse]
     count: int = Field(..., description="Number of events returned in this response")
-    total: int = Field(..., description="Total matching events (may exceed count)")
+    total: Optional[int] = Field(
+        None,
+        description="Total matching events (may exceed count); null when not computed, e.g. nearest-events queries without radius",
+    )
+    total_estimated: bool = Field(False, description="True when total is a query-planner estimate (total_mode=estimate)")
     next_cursor: Optional[str] = Field(None, description="Cursor for next page; null if no more results")
 
     model_config = {
@@ -231,6 +263,7 @@ class EventsNearbyResponse(BaseModel):
                             "audience": "adults",
                             "event_type": "meetup",
                             "created_at": "2026-03-01T12:00:00Z",
+                            "distance_miles": 0.0,
                         },
                         {
                             "event_id": "01JAQRS5678901234MNOPQRST",
@@ -249,12 +282,204 @@ class EventsNearbyResponse(BaseModel):
                             "audience": "all",
                             "event_type": "market",
                             "created_at": "2026-03-02T09:30:00Z",
+                            "distance_miles": 2.019,
                         },
                     ],
                     "count": 2,
                     "total": 45,
+                    "total_estimated": False,
                     "next_cursor": "MjAyNi0wMy0xNlQwODowMDowMCswMDowMHwwMUpBUVJTNTY3ODkwMTIzNE1OT1BRUlNU",
                 }
             ]
         }
     }
+
+
+class EventsByIdResponse(BaseModel):
+    events: List[EventResponse] = Field(..., description="Found events, in the order their ids were requested")
+    missing: List[str] = Field(..., description="Requested event_ids that do not exist (deleted or never created)")
+
+
+# Read fast path: the same wire format as EventResponse, EventsNearbyResponse
+# and EventsByIdResponse, as plain dicts that pydantic-core serialises to JSON
+# without building or validating models. Keys must stay in the order of the
+# models' fields. EventDict is total=False for fields= projections.
+class EventDict(TypedDict, total=False):
+    event_id: str
+    agent_id: str
+    title: str
+    description: Optional[str]
+    start_at: datetime
+    end_at: Optional[datetime]
+    timezone: str
+    location_name: str
+    address: Optional[str]
+    lat: float
+    lng: float
+    url: Optional[str]
+    cost: Optional[str]
+    audience: str
+    event_type: str
+    created_at: datetime
+    distance_miles: Optional[float]
+
+
+class EventsNearbyDict(TypedDict):
+    events: List[EventDict]
+    count: int
+    total: Optional[int]
+    total_estimated: bool
+    next_cursor: Optional[str]
+
+
+class EventsByIdDict(TypedDict):
+    events: List[EventDict]
+    missing: List[str]
+
+
+class ExportItemDict(TypedDict):
+    cursor: str
+    event: EventDict
+
+
+event_json = TypeAdapter(EventDict)
+export_item_json = TypeAdapter(ExportItemDict)
+events_nearby_json = TypeAdapter(EventsNearbyDict)
+events_by_id_json = TypeAdapter(EventsByIdDict)
+
+
+class EventBatchCreate(BaseModel):
+    events: List[Dict[str, Any]] = Field(
+        ...,
+        min_length=1,
+        max_length=EVENT_BATCH_MAX,
+        description=f"Up to {EVENT_BATCH_MAX} EventCreate objects. Each is validated on its own; invalid items are reported, not fatal.",
+    )
+
+
+class BatchItemStatus(str, Enum):
+    CREATED = "created"
+    UPDATED = "updated"
+    DUPLICATE = "duplicate"
+    ERROR = "error"
+
+
+class EventBatchItemResult(BaseModel):
+    index: int = Field(..., description="Position of the item in the request's events list")
+    status: BatchItemStatus
+    event_id: Optional[str] = Field(None, description="New event_id, or the existing one for updated/duplicate items")
+    error: Optional[ErrorDetail] = None
+
+
+class EventBatchCreateResponse(BaseModel):
+    results: List[EventBatchItemResult]
+    created: int
+    updated: int = 0
+    duplicates: int
+    errors: int
+
+    model_config = {
+        "json_schema_extra": {
+            "examples": [
+                {
+                    "results": [
+                        {"index": 0, "status": "created", "event_id": "01JAXYZ1234567890ABCDEFGH", "error": None},
+                        {"index": 1, "status": "duplicate", "event_id": "01JAQRS5678901234MNOPQRST", "error": None},
+                        {
+                            "index": 2,
+                            "status": "error",
+                            "event_id": None,
+                            "error": {"code": "VALIDATION_ERROR", "message": "lat: Input should be less than or equal to 90", "status": 422},
+                        },
+                    ],
+                    "created": 1,
+                    "updated": 0,
+                    "duplicates": 1,
+                    "errors": 1,
+                }
+            ]
+        }
+    }
+
+
+class EventBatchFilter(BaseModel):
+    """Selects the caller's own events. Criteria are ANDed; list fields match
+    any value. At least one criterion is required: an empty filter is
+    rejected rather than taken to mean every event."""
+
+    event_type: Optional[List[EventType]] = Field(None, min_length=1)
+    audience: Optional[List[Audience]] = Field(None, min_length=1)
+    title: Optional[str] = Field(None, min_length=1, max_length=200, description="Exact title match")
+    starts_after: Optional[datetime] = Field(None, description="start_at at or after this time (inclusive)")
+    starts_before: Optional[datetime] = Field(None, description="start_at before this time (exclusive)")
+
+    @model_validator(mode="after")
+    def _has_criterion(self):
+        if (
+            self.event_type is None
+            and self.audience is None
+            and self.title is None
+            and self.starts_after is None
+            and self.starts_before is None
+        ):
+            raise ValueError(
+                "filter needs at least one of event_type, audience, title, starts_after or starts_before"
+            )
+        return self
+
+
+class _EventBatchSelection(BaseModel):
+    event_ids: Optional[List[str]] = Field(
+        None,
+        min_length=1,
+        max_length=EVENT_BATCH_MAX,
+        description=f"Up to {EVENT_BATCH_MAX} event_ids. Events you do not own are reported as not_found.",
+    )
+    filter: Optional[EventBatchFilter] = Field(
+        None, description="Alternative to event_ids: all of your own events matching these criteria."
+    )
+
+    @model_validator(mode="after")
+    def _one_selector(self):
+        if (self.event_ids is None) == (self.filter is None):
+            raise ValueError("provide exactly one of event_ids or filter")
+        return self
+
+
+class EventBatchUpdate(_EventBatchSelection):
+    changes: EventUpdate = Field(..., description="Fields to set on every selected event, as in PATCH /v1/events/{event_id}")
+
+
+class EventBatchDelete(_EventBatchSelection):
+    pass
+
+
+class EventBatchUpdateResponse(BaseModel):
+    updated: List[str] = Field(..., description="event_ids that were updated")
+    not_found: List[str] = Field(..., description="Requested event_ids that do not exist or that you do not own (always empty for filter)")
+    count: int = Field(..., description="Number of events updated")
+
+
+class EventBatchDeleteResponse(BaseModel):
+    deleted: List[str] = Field(..., description="event_ids that were deleted")
+    not_found: List[str] = Field(..., description="Requested event_ids that do not exist or that you do not own (always empty for filter)")
+    count: int = Field(..., description="Number of events deleted")
+
+
+class ChangeType(str, Enum):
+    UPSERT = "upsert"
+    DELETE = "delete"
+
+
+class EventChange(BaseModel):
+    type: ChangeType
+    event_id: str
+    changed_at: datetime = Field(..., description="updated_at of the event, or the time it was deleted")
+    event: Optional[EventResponse] = Field(None, description="Current event for upserts; null for deletes")
+
+
+class EventChangesResponse(BaseModel):
+    changes: List[EventChange] = Field(..., description="Changes ordered by (changed_at, event_id)")
+    count: int
+    next_cursor: str = Field(..., description="Pass as cursor on the next call. Always present, so an empty page can be polled again.")
+    has_more: bool = Field(..., description="True if more changes are already available")
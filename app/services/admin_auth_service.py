@@ -1,5 +1,103 @@
+import asyncio
+import hashlib
+import json
+import logging
+import re
+import time
+import urllib.request
+from typing import Any, Callable, Dict, Optional, Tuple
+
 import firebase_admin
-from firebase_admin import auth as firebase_auth
+import jwt
+from cryptography.x509 import load_pem_x509_certificate
+
+from app.config import settings
+from app.services.cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+_ISSUER_PREFIX = "https://securetoken.google.com/"
+# Google rotates keys well ahead of use; a token signed with an unknown kid
+# triggers at most one extra fetch per this interval.
+KEY_REFETCH_MIN_SECONDS = 60.0
+KEY_REFRESH_RETRY_SECONDS = 30.0
+_DEFAULT_MAX_AGE = 3600.0
+_MAX_AGE = re.compile(r"max-age=(\d+)")
+
+# sha256(ID token) -> claims, each kept until the token's exp.
+verified_token_cache: TTLCache[dict] = TTLCache(
+    max_size=settings.admin_token_cache_size,
+    ttl_seconds=settings.admin_token_cache_ttl_seconds,
+)
+
+
+class FirebaseKeySet:
+    """Public keys that sign Firebase ID tokens, by key id.
+
+    Fetched from ``url`` (Google's x509 endpoint, or a file:// stand-in) off
+    the event loop and kept until the response's Cache-Control max-age.
+    """
+
+    def __init__(self, url: str, clock: Callable[[], float] = time.monotonic) -> None:
+        self.url = url
+        self._clock = clock
+        self._keys: Dict[str, Any] = {}
+        self._expires_at = 0.0
+        self._fetched_at = float("-inf")
+        self._lock = asyncio.Lock()
+
+    @property
+    def expires_in(self) -> float:
+        return self._expires_at - self._clock()
+
+    def load(self, certs: Dict[str, str], max_age: float = _DEFAULT_MAX_AGE) -> None:
+        """Install ``{kid: PEM certificate}``; also how tests supply local keys."""
+        self._keys = {
+            kid: load_pem_x509_certificate(pem.encode()).public_key() for kid, pem in certs.items()
+        }
+        self._expires_at = self._clock() + max_age
+
+    def _fetch(self) -> Tuple[Dict[str, str], float]:
+        with urllib.request.urlopen(self.url, timeout=10) as resp:
+            certs = json.load(resp)
+            match = _MAX_AGE.search(resp.headers.get("Cache-Control") or "")
+        return certs, float(match.group(1)) if match else _DEFAULT_MAX_AGE
+
+    async def refresh(self, seen: Optional[float] = None) -> None:
+        """Fetch the keys. With ``seen`` (the ``_fetched_at`` the caller
+        observed), skip if another caller fetched while this one waited."""
+        async with self._lock:
+            if seen is not None and self._fetched_at != seen:
+                return
+            self._fetched_at = self._clock()
+            certs, max_age = await asyncio.to_thread(self._fetch)
+            self.load(certs, max_age)
+
+    async def key_for(self, kid: Optional[str]):
+        key = self._keys.get(kid) if self.expires_in > 0 else None
+        fetched_at = self._fetched_at
+        if key is None and self._clock() - fetched_at >= KEY_REFETCH_MIN_SECONDS:
+            # First use, keys past their max-age, or Google rotated in a key
+            # the refresher has not seen yet.
+            await self.refresh(fetched_at)
+            key = self._keys.get(kid) if self.expires_in > 0 else None
+        # Expired keys are never used: if the refetch failed or is rate
+        # limited, the token is rejected.
+        return key
+
+
+_key_set = FirebaseKeySet(settings.firebase_certs_url)
+_project_id: Optional[str] = None
+
+
+def get_firebase_key_set() -> FirebaseKeySet:
+    return _key_set
+
+
+def set_firebase_key_set(key_set: FirebaseKeySet) -> None:
+    global _key_set
+    _key_set = key_set
+    verified_token_cache.clear()
 
 
 def _ensure_app():
@@ -7,13 +105,70 @@ def _ensure_app():
         firebase_admin.initialize_app()
 
 
-def verify_firebase_token(id_token: str) -> dict:
-    """Verify a Firebase ID token and return user claims."""
+def _firebase_project_id() -> str:
     _ensure_app()
-    decoded = firebase_auth.verify_id_token(id_token)
-    return {
-        "uid": decoded["uid"],
+    project_id = firebase_admin.get_app().project_id
+    if not project_id:
+        raise ValueError("Firebase project id is not configured (set FIREBASE_PROJECT_ID)")
+    return project_id
+
+
+async def _get_project_id() -> str:
+    global _project_id
+    if _project_id is None:
+        _project_id = settings.firebase_project_id or await asyncio.to_thread(_firebase_project_id)
+    return _project_id
+
+
+def _decode(id_token: str, key, project_id: str) -> dict:
+    """The checks firebase_auth.verify_id_token makes, against a known key."""
+    decoded = jwt.decode(
+        id_token,
+        key,
+        algorithms=["RS256"],
+        audience=project_id,
+        issuer=_ISSUER_PREFIX + project_id,
+        options={"require": ["exp", "iat", "sub"]},
+    )
+    if not decoded["sub"] or len(decoded["sub"]) > 128:
+        raise jwt.InvalidTokenError("invalid sub claim")
+    if decoded.get("auth_time", 0) > time.time():
+        raise jwt.InvalidTokenError("auth_time is in the future")
+    return decoded
+
+
+async def verify_firebase_token(id_token: str) -> dict:
+    """Verify a Firebase ID token and return user claims.
+
+    Claims are cached until the token expires, so a dashboard session pays
+    for one RSA verification (done in a worker thread) per token.
+    """
+    cache_key = hashlib.sha256(id_token.encode()).digest()
+    claims = verified_token_cache.get(cache_key)
+    if claims is not None:
+        return claims
+
+    key = await _key_set.key_for(jwt.get_unverified_header(id_token).get("kid"))
+    if key is None:
+        raise jwt.InvalidTokenError("token signed with an unknown key")
+    decoded = await asyncio.to_thread(_decode, id_token, key, await _get_project_id())
+    claims = {
+        "uid": decoded["sub"],
         "email": decoded.get("email", ""),
         "name": decoded.get("name", ""),
         "picture": decoded.get("picture", ""),
     }
+    verified_token_cache.set(cache_key, claims, decoded["exp"] - time.time())
+    return claims
+
+
+async def run_firebase_key_refresher() -> None:
+    """Fetch the signing keys ahead of first use and again before they expire."""
+    while True:
+        try:
+            await _key_set.refresh()
+            delay = max(KEY_REFETCH_MIN_SECONDS, _key_set.expires_in * 0.9)
+        except Exception as e:
+            logger.warning("Failed to fetch Firebase signing keys: %s", e)
+            delay = KEY_REFRESH_RETRY_SECONDS
+        await asyncio.sleep(delay)
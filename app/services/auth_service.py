@@ -1,15 +1,24 @@
+import asyncio
+import hashlib
+import logging
 import secrets
 import uuid
 from datetime import datetime, timezone
-from typing import Optional, Tuple
+from typing import Dict, List, Optional, Tuple
 
 from passlib.context import CryptContext
-from sqlalchemy import select
+from sqlalchemy import DateTime, column, func, literal, or_, select, tuple_, update, values
+from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config import settings
+from app.database import async_session_factory
 from app.models.api_key import ApiKey
 from app.schemas.auth import RegisterRequest, RegisterResponse
+from app.services.cache import TTLCache
+from app.services.event_service import CURSOR_AGENTS, _decode_cursor, _encode_cursor
+
+logger = logging.getLogger(__name__)
 
 pwd_context = CryptContext(schemes=["argon2"], deprecated="auto")
 
@@ -17,6 +26,18 @@ KEY_PREFIX_LEN = 8
 KEY_SECRET_LEN = 32
 KEY_CHARS = "abcdefghijklmnopqrstuvwxyz0123456789"
 
+# sha256(presented key) -> detached ApiKey. Only keys that passed argon2
+# verification are stored, so a hit is as good as a verify.
+verified_key_cache: TTLCache[ApiKey] = TTLCache(
+    max_size=settings.api_key_cache_size,
+    ttl_seconds=settings.api_key_cache_ttl_seconds,
+)
+
+# key id -> newest use not yet written to api_keys.last_used_at
+_pending_last_used: Dict[uuid.UUID, datetime] = {}
+# key id -> newest use already queued or written, for the granularity check
+_recorded_last_used: Dict[uuid.UUID, datetime] = {}
+
 
 def generate_api_key() -> Tuple[str, str]:
     """Generate a new API key and its prefix. Returns (full_key, prefix)."""
@@ -35,9 +56,65 @@ def verify_key(plain_key: str, hashed: str) -> bool:
     return pwd_context.verify(plain_key, hashed)
 
 
+def _cache_key(api_key: str) -> bytes:
+    return hashlib.sha256(api_key.encode()).digest()
+
+
+def invalidate_api_key(key_id: uuid.UUID) -> int:
+    """Drop cached verifications for a key after it is deactivated or deleted."""
+    return verified_key_cache.discard_where(lambda _k, cached: cached.id == key_id)
+
+
+async def list_api_keys(
+    db: AsyncSession,
+    limit: int,
+    cursor: Optional[str] = None,
+    search: Optional[str] = None,
+) -> Tuple[List[ApiKey], int, Optional[str]]:
+    """One keyset page of API keys, newest first, optionally matching
+    ``search`` as a case-insensitive substring of email or agent name.
+    Returns (agents, total, next_cursor); the total is counted on the first
+    page and carried in the cursor.
+
+    Raises ValueError for a malformed cursor or one from another endpoint.
+    """
+    filters = []
+    if search is not None:
+        pattern = "%" + search.replace("/", "//").replace("%", "/%").replace("_", "/_") + "%"
+        filters.append(or_(ApiKey.email.ilike(pattern, escape="/"), ApiKey.agent_name.ilike(pattern, escape="/")))
+
+    if cursor is not None:
+        decoded = _decode_cursor(cursor)
+        if decoded.sort != CURSOR_AGENTS or decoded.total is None:
+            raise ValueError("cursor: not an agents cursor")
+        total = decoded.total
+        page_filters = [
+            *filters,
+            tuple_(ApiKey.created_at, ApiKey.id)
+            < tuple_(literal(decoded.key, ApiKey.created_at.type), literal(uuid.UUID(decoded.event_id), ApiKey.id.type)),
+        ]
+    else:
+        total = (await db.execute(select(func.count()).select_from(ApiKey).where(*filters))).scalar_one()
+        page_filters = filters
+
+    result = await db.execute(
+        select(ApiKey)
+        .where(*page_filters)
+        .order_by(ApiKey.created_at.desc(), ApiKey.id.desc())
+        .limit(limit + 1)
+    )
+    agents = list(result.scalars())
+
+    next_cursor = None
+    if len(agents) > limit:
+        agents = agents[:limit]
+        next_cursor = _encode_cursor(CURSOR_AGENTS, agents[-1].created_at, str(agents[-1].id), total)
+    return agents, total, next_cursor
+
+
 async def register_agent(db: AsyncSession, req: RegisterRequest) -> RegisterResponse:
     full_key, key_prefix = generate_api_key()
-    key_hash = hash_key(full_key)
+    key_hash = await asyncio.to_thread(hash_key, full_key)
 
     api_key = ApiKey(
         id=uuid.uuid4(),
@@ -64,6 +141,10 @@ async def register_agent(db: AsyncSession, req: RegisterRequest) -> RegisterResp
 async def get_api_key_by_header(db: AsyncSession, api_key: str) -> Optional[ApiKey]:
     if not api_key or len(api_key) < len(settings.api_key_prefix) + KEY_PREFIX_LEN:
         return None
+    digest = _cache_key(api_key)
+    cached = verified_key_cache.get(digest)
+    if cached is not None:
+        return cached
     key_prefix = api_key[: len(settings.api_key_prefix) + KEY_PREFIX_LEN]
     result = await db.execute(
         select(ApiKey).where(
@@ -74,11 +155,72 @@ async def get_api_key_by_header(db: AsyncSession, api_key: str) -> Optional[ApiK
     row = result.scalar_one_or_none()
     if row is None:
         return None
-    if not verify_key(api_key, row.key_hash):
+    # argon2 is deliberately slow; keep it off the event loop.
+    if not await asyncio.to_thread(verify_key, api_key, row.key_hash):
         return None
+    # Detach so the cached instance outlives this session and is never
+    # flushed from another request's unit of work.
+    db.expunge(row)
+    verified_key_cache.set(digest, row)
     return row
 
 
-async def update_last_used(db: AsyncSession, api_key: ApiKey) -> None:
-    api_key.last_used_at = datetime.now(timezone.utc)
-    await db.flush()
+def record_last_used(api_key: ApiKey) -> None:
+    """Note a use of the key in memory; written later by flush_last_used().
+
+    Uses closer than last_used_granularity_seconds to the previously recorded
+    one are dropped, so hot keys queue at most one write per window.
+    """
+    now = datetime.now(timezone.utc)
+    last = _recorded_last_used.get(api_key.id) or api_key.last_used_at
+    if last is not None and (now - last).total_seconds() < settings.last_used_granularity_seconds:
+        return
+    _recorded_last_used[api_key.id] = now
+    _pending_last_used[api_key.id] = now
+
+
+async def flush_last_used() -> int:
+    """Write all buffered last_used_at values in a single UPDATE ... FROM (VALUES ...)."""
+    if not _pending_last_used:
+        return 0
+    pending = dict(_pending_last_used)
+    _pending_last_used.clear()
+
+    rows = values(
+        column("id", UUID(as_uuid=True)),
+        column("used_at", DateTime(timezone=True)),
+        name="pending",
+    ).data(list(pending.items()))
+    stmt = (
+        update(ApiKey)
+        .where(
+            ApiKey.id == rows.c.id,
+            or_(ApiKey.last_used_at.is_(None), ApiKey.last_used_at < rows.c.used_at),
+        )
+        .values(last_used_at=rows.c.used_at)
+        .execution_options(synchronize_session=False)
+    )
+    try:
+        async with async_session_factory() as session:
+            await session.execute(stmt)
+            await session.commit()
+    except Exception:
+        for key_id, used_at in pending.items():
+            if _pending_last_used.get(key_id, used_at) <= used_at:
+                _pending_last_used[key_id] = used_at
+        raise
+
+    # Entries older than the granularity window no longer suppress anything.
+    cutoff = datetime.now(timezone.utc).timestamp() - settings.last_used_granularity_seconds
+    for key_id in [k for k, v in _recorded_last_used.items() if v.timestamp() < cutoff]:
+        del _recorded_last_used[key_id]
+    return len(pending)
+
+
+async def run_last_used_flusher() -> None:
+    while True:
+        await asyncio.sleep(settings.last_used_flush_interval_seconds)
+        try:
+            await flush_last_used()
+        except Exception:
+            logger.exception("Failed to flush api_keys.last_used_at")
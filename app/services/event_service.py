@@ -1,109 +1,701 @@
+import asyncio
 import base64
+import binascii
+import heapq
+import itertools
+import json
+import logging
 import math
-from datetime import datetime, timezone
-from typing import List, Optional, Tuple
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from typing import AsyncIterator, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple, Union
 
-from sqlalchemy import and_, delete, func, or_, select
+from sqlalchemy import (
+    Boolean,
+    DateTime,
+    Double,
+    String,
+    any_,
+    bindparam,
+    delete,
+    false,
+    func,
+    literal,
+    literal_column,
+    select,
+    text,
+    true,
+    tuple_,
+    union_all,
+    update,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, insert as pg_insert
+from sqlalchemy.event import listens_for
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.base import Executable
+from sqlalchemy.sql.elements import ClauseElement, ColumnElement
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
 from ulid import ULID
 
 from zoneinfo import ZoneInfo
 
+from app.config import settings
+from app.database import async_session_factory
+from app.models.api_key import ApiKey
 from app.models.event import Event
-from app.schemas.event import EventCreate, EventResponse, EventUpdate
+from app.models.event_tombstone import EventTombstone
+from app.schemas.event import (
+    EVENT_FIELDS,
+    BatchItemStatus,
+    ChangeType,
+    EventChange,
+    EventChangesResponse,
+    EventBatchDelete,
+    EventBatchDeleteResponse,
+    EventBatchFilter,
+    EventBatchUpdate,
+    EventBatchUpdateResponse,
+    EventCreate,
+    EventDict,
+    EventResponse,
+    EventsByIdDict,
+    EventsNearbyDict,
+    EventUpdate,
+    ExportItemDict,
+)
+from app.services.cache import TTLCache
+from app.services.geo import (
+    MILES_TO_METERS,
+    SPATIAL_POINT,
+    SPATIAL_POSTGIS,
+    bounding_boxes,
+    geography_point_sql,
+    haversine_miles,
+    haversine_miles_sql,
+    point_in_boxes,
+)
+
+logger = logging.getLogger(__name__)
 
-MILES_TO_METERS = 1609.34
-METERS_PER_DEG_LAT = 111_320.0
 NEARBY_LIMIT_DEFAULT = 30
 NEARBY_LIMIT_MAX = 100
 
+# Expanding-ring k-NN search for radius-less queries on the point fallback.
+NEAREST_INITIAL_RADIUS_MILES = 10.0
+NEAREST_RING_GROWTH = 4.0
+NEAREST_MAX_RADIUS_MILES = 12_450.0  # half the Earth's circumference: the whole globe
+
+# Generated by migration 005 when PostGIS is available; not mapped on Event
+# because it does not exist in the fallback schema.
+_EVENT_GEOG = literal_column("events.geog")
+
+_spatial_mode: Optional[str] = None
+
+# Open-ended events never end. Written as a literal, not a bind parameter, so
+# the planner can match idx_events_effective_end.
+_EFFECTIVE_END = func.coalesce(
+    Event.end_at,
+    literal_column("'infinity'::timestamp with time zone", type_=DateTime(timezone=True)),
+)
+
+
+async def _get_spatial_mode(db: AsyncSession) -> str:
+    global _spatial_mode
+    if _spatial_mode is None:
+        if settings.spatial_index in (SPATIAL_POSTGIS, SPATIAL_POINT):
+            _spatial_mode = settings.spatial_index
+        else:
+            result = await db.execute(
+                text(
+                    "SELECT 1 FROM information_schema.columns "
+                    "WHERE table_name = 'events' AND column_name = 'geog'"
+                )
+            )
+            _spatial_mode = SPATIAL_POSTGIS if result.scalar() is not None else SPATIAL_POINT
+    return _spatial_mode
+
+
+class _CacheRegion(NamedTuple):
+    """Spherical cap a cached page depends on; radius None means everywhere."""
+
+    lat: float
+    lng: float
+    radius_miles: Optional[float]
+
+    def contains(self, lat: float, lng: float) -> bool:
+        if self.radius_miles is None:
+            return True
+        return haversine_miles(self.lat, self.lng, lat, lng) <= self.radius_miles + _REGION_SLACK_MILES
+
+
+# Absorbs the sphere vs. haversine rounding differences between SQL and Python.
+_REGION_SLACK_MILES = 0.01
+# Beyond this many changed points, dropping everything is cheaper than matching.
+_INVALIDATE_CLEAR_THRESHOLD = 256
+
+# Farthest a caller's point can be from its snapped cell center: half a cell
+# diagonal, with a degree taken as 69.1 miles.
+_SNAP_SLACK_MILES = 0.5 * 10 ** -settings.nearby_cache_precision * 69.1 * math.sqrt(2)
+# A cell entry holds this many pages' worth of rows, so most callers in the
+# cell still find a full page after dropping rows outside their own radius.
+_CELL_FETCH_PAGES = 2
+
+
+class _CellRows(NamedTuple):
+    """start_at-ordered rows within radius + _SNAP_SLACK_MILES of a snapped
+    cell center, shared by every caller in the cell."""
+
+    rows: list
+    exhausted: bool  # no matching rows beyond these
+
+
+# key -> (region, page) for an exact query point, or (region, _CellRows) for
+# a snapped cell.
+nearby_cache: TTLCache[Tuple[_CacheRegion, Union[EventsNearbyDict, _CellRows]]] = TTLCache(
+    max_size=settings.nearby_cache_size,
+    ttl_seconds=settings.nearby_cache_ttl_seconds,
+)
+
+
+def invalidate_nearby(points: Iterable[Tuple[float, float]]) -> None:
+    """Evict cached nearby pages whose region contains any changed event."""
+    if not len(nearby_cache):
+        return
+    points = list(points)
+    if len(points) > _INVALIDATE_CLEAR_THRESHOLD:
+        nearby_cache.clear()
+        return
+    nearby_cache.discard_where(
+        lambda _key, entry: any(entry[0].contains(lat, lng) for lat, lng in points)
+    )
+
+
+# Every committed write is announced on this channel (LISTEN/NOTIFY) so other
+# workers evict their nearby caches and live /stream subscribers see it.
+CHANGES_CHANNEL = "event_changes"
+CHANGE_CREATE = "create"
+CHANGE_UPDATE = "update"
+CHANGE_DELETE = "delete"
+_NOTIFY_PAYLOAD_MAX = 7800  # bytes; PostgreSQL rejects NOTIFY payloads of 8000+
+
+
+class Change(NamedTuple):
+    kind: str
+    event_id: str
+    lat: float
+    lng: float
+    event_type: Optional[str] = None  # None for deletes
+    audience: Optional[str] = None
+    old_lat: Optional[float] = None  # where an update moved the event from
+    old_lng: Optional[float] = None
+
+    def points(self) -> List[Tuple[float, float]]:
+        if self.old_lat is None or (self.old_lat, self.old_lng) == (self.lat, self.lng):
+            return [(self.lat, self.lng)]
+        return [(self.lat, self.lng), (self.old_lat, self.old_lng)]
+
+
+_NOTIFY = text(
+    "SELECT pg_notify(:channel, payload) FROM unnest(CAST(:payloads AS text[])) AS payload"
+)
+
+
+def pack_changes(changes: List[Change]) -> List[str]:
+    """JSON arrays of changes, each small enough for one NOTIFY."""
+    chunks: List[str] = []
+    items: List[str] = []
+    size = 2
+    for change in changes:
+        item = json.dumps(list(change), separators=(",", ":"))
+        if items and size + len(item) + 1 > _NOTIFY_PAYLOAD_MAX:
+            chunks.append("[" + ",".join(items) + "]")
+            items, size = [], 2
+        items.append(item)
+        size += len(item) + 1
+    if items:
+        chunks.append("[" + ",".join(items) + "]")
+    return chunks
+
+
+def unpack_changes(payload: str) -> List[Change]:
+    return [Change(*item) for item in json.loads(payload)]
+
+
+# Session.info key: points whose cached nearby pages are evicted on commit.
+_PENDING_EVICTIONS = "nearby_evictions"
+
 
-def _encode_cursor(start_at: datetime, event_id: str) -> str:
-    raw = f"{start_at.isoformat()}|{event_id}"
+@listens_for(Session, "after_commit")
+def _evict_after_commit(session: Session) -> None:
+    points = session.info.pop(_PENDING_EVICTIONS, None)
+    if points:
+        invalidate_nearby(points)
+
+
+@listens_for(Session, "after_rollback")
+def _drop_pending_evictions(session: Session) -> None:
+    session.info.pop(_PENDING_EVICTIONS, None)
+
+
+async def _publish(db: AsyncSession, changes: List[Change]) -> None:
+    """Evict this worker's nearby cache once the transaction commits, and
+    queue a notification for everyone else. NOTIFY is transactional too: it
+    is only delivered on commit.
+
+    Evicting at commit rather than now keeps a concurrent read on this worker
+    from re-caching the pre-commit rows after the eviction.
+    """
+    if not changes:
+        return
+    db.sync_session.info.setdefault(_PENDING_EVICTIONS, []).extend(
+        p for c in changes for p in c.points()
+    )
+    if settings.live_updates_enabled:
+        await db.execute(
+            _NOTIFY, {"channel": CHANGES_CHANNEL, "payloads": pack_changes(changes)}
+        )
+
+
+class _Explain(Executable, ClauseElement):
+    """``EXPLAIN (FORMAT JSON) <stmt>``, with the statement's parameters bound."""
+
+    inherit_cache = False
+
+    def __init__(self, stmt) -> None:
+        self.stmt = stmt
+
+
+@compiles(_Explain, "postgresql")
+def _compile_explain(element: _Explain, compiler, **kw) -> str:
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.stmt, **kw)
+
+
+async def _estimate_count(db: AsyncSession, filters: List[ColumnElement]) -> int:
+    """Planner row estimate for the filtered events — no rows are read."""
+    result = await db.execute(_Explain(select(Event.event_id).where(*filters)))
+    plan = result.scalar_one()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+async def _count(db: AsyncSession, filters: List[ColumnElement], total_mode: str) -> int:
+    if total_mode == TOTAL_ESTIMATE:
+        return await _estimate_count(db, filters)
+    result = await db.execute(select(func.count()).select_from(Event).where(*filters))
+    return result.scalar_one()
+
+
+class _SpatialTerms(NamedTuple):
+    distance_miles: ColumnElement
+    # ORDER BY expression for sort=distance. For PostGIS this is the bare
+    # ``geog <-> ref`` so the GiST index can drive a nearest-neighbour scan.
+    order_key: ColumnElement
+    filters: List[ColumnElement]
+
+
+def _spatial_terms(mode: str, lat: float, lng: float, radius_miles: Optional[float]) -> _SpatialTerms:
+    """Distance expressions and index-backed radius predicates for one query point."""
+    if mode == SPATIAL_POSTGIS:
+        ref = geography_point_sql(lat, lng)
+        # Sphere distance in meters, the same metric ST_DWithin(..., false) uses.
+        meters = _EVENT_GEOG.op("<->", return_type=Double)(ref)
+        filters = []
+        if radius_miles is not None:
+            filters.append(func.ST_DWithin(_EVENT_GEOG, ref, radius_miles * MILES_TO_METERS, false()))
+        return _SpatialTerms(meters / MILES_TO_METERS, meters, filters)
+
+    distance = haversine_miles_sql(Event.lat, Event.lng, lat, lng)
+    filters = []
+    if radius_miles is not None:
+        # GiST box lookup first, then the exact great-circle check.
+        boxes = bounding_boxes(lat, lng, radius_miles)
+        filters = [point_in_boxes(Event.lat, Event.lng, boxes), distance <= radius_miles]
+    return _SpatialTerms(distance, distance, filters)
+
+
+SORT_START_AT = "start_at"
+SORT_DISTANCE = "distance"
+# Position in the changes feed: key is the change time.
+CURSOR_CHANGES = "changes"
+# Position in one agent's events, newest first: key is created_at.
+CURSOR_AGENT = "agent"
+# Position in the admin agent list, newest first: key is the key's
+# created_at, id its UUID.
+CURSOR_AGENTS = "agents"
+
+TOTAL_EXACT = "exact"
+TOTAL_ESTIMATE = "estimate"
+
+
+class _Cursor(NamedTuple):
+    sort: str
+    key: Union[datetime, float]  # a timestamp, or the raw distance sort key
+    event_id: str
+    # Total from the first page, carried forward so later pages skip the count.
+    total: Optional[int] = None
+    total_estimated: bool = False
+
+
+def _encode_cursor(
+    sort: str,
+    key: Union[datetime, float],
+    event_id: str,
+    total: Optional[int] = None,
+    total_estimated: bool = False,
+) -> str:
+    payload = {
+        "s": sort,
+        "k": key.isoformat() if isinstance(key, datetime) else key,
+        "id": event_id,
+    }
+    if total is not None:
+        payload["t"] = total
+        if total_estimated:
+            payload["te"] = True
+    raw = json.dumps(payload, separators=(",", ":"))
     return base64.urlsafe_b64encode(raw.encode()).decode()
 
 
-def _decode_cursor(cursor: str) -> Tuple[datetime, str]:
-    raw = base64.urlsafe_b64decode(cursor.encode()).decode()
-    iso, event_id = raw.rsplit("|", 1)
-    return datetime.fromisoformat(iso), event_id
+def _decode_cursor(cursor: str) -> _Cursor:
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+        if not raw.startswith("{"):
+            # Pre-sort cursors: "<start_at iso>|<event_id>"
+            iso, event_id = raw.rsplit("|", 1)
+            return _Cursor(SORT_START_AT, datetime.fromisoformat(iso), event_id)
+        payload = json.loads(raw)
+        sort = payload["s"]
+        if sort in (SORT_START_AT, CURSOR_CHANGES, CURSOR_AGENT, CURSOR_AGENTS):
+            key = datetime.fromisoformat(payload["k"])
+        elif sort == SORT_DISTANCE:
+            key = float(payload["k"])
+        else:
+            raise ValueError(sort)
+        total = payload.get("t")
+        return _Cursor(
+            sort,
+            key,
+            str(payload["id"]),
+            None if total is None else int(total),
+            bool(payload.get("te", False)),
+        )
+    except (binascii.Error, UnicodeDecodeError, ValueError, KeyError, TypeError):
+        raise ValueError("cursor: invalid cursor") from None
+
+
+# EventResponse fields stored as columns of the same name.
+_COLUMN_FIELDS = tuple(f for f in EVENT_FIELDS if f != "distance_miles")
+
+
+def _projected(fields: Optional[Sequence[str]]) -> Tuple[str, ...]:
+    if fields is None:
+        return _COLUMN_FIELDS
+    return tuple(f for f in _COLUMN_FIELDS if f == "event_id" or f in fields)
 
 
-def _event_to_response(e: Event) -> EventResponse:
-    return EventResponse(
-        event_id=e.event_id,
-        agent_id=str(e.agent_id),
-        title=e.title,
-        description=e.description,
-        start_at=e.start_at,
-        end_at=e.end_at,
-        timezone=e.timezone,
-        location_name=e.location_name,
-        address=e.address,
-        lat=e.lat,
-        lng=e.lng,
-        url=e.url,
-        cost=e.cost,
-        audience=e.audience,
-        event_type=e.event_type,
-        created_at=e.created_at,
+def _event_columns(fields: Optional[Sequence[str]] = None) -> list:
+    """Columns to select for a ``fields=`` projection; event_id is always included.
+
+    Reads select these instead of the Event entity, so rows skip ORM
+    hydration and the identity map, and unrequested columns such as
+    description are never fetched.
+    """
+    return [getattr(Event, f) for f in _projected(fields)]
+
+
+def _event_dict(
+    e,
+    distance_miles: Optional[float] = None,
+    fields: Optional[Sequence[str]] = None,
+) -> EventDict:
+    """Wire-format dict for an Event or a row from _event_columns(fields).
+    With ``fields``, only those keys are present."""
+    d = {f: getattr(e, f) for f in _projected(fields)}
+    if "agent_id" in d:
+        d["agent_id"] = str(d["agent_id"])
+    if fields is None or "distance_miles" in fields:
+        d["distance_miles"] = None if distance_miles is None else round(distance_miles, 3)
+    return d
+
+
+def _event_to_response(e) -> EventResponse:
+    return EventResponse(**_event_dict(e))
+
+
+ON_DUPLICATE_RETURN = "return"
+ON_DUPLICATE_UPDATE = "update"
+
+# Columns refreshed by on_duplicate=update. The natural key columns are equal
+# by definition, and created_at keeps the original insert time.
+_UPSERT_UPDATE_COLUMNS = (
+    "description", "end_at", "timezone", "location_name", "address",
+    "url", "cost", "audience", "event_type", "updated_at",
+)
+
+
+# Write time of a change, for the changes feed. Taken by the database as the
+# row is written rather than by the app before the statement, so it is never
+# earlier than the writing transaction's start; see _changes_horizon.
+def _stamp() -> ColumnElement:
+    return func.clock_timestamp()
+
+
+def _event_row(api_key_id, req: EventCreate) -> dict:
+    return {
+        "event_id": str(ULID()),
+        "agent_id": api_key_id,
+        "title": req.title,
+        "description": req.description,
+        "start_at": req.start_at,
+        "end_at": req.end_at,
+        "timezone": req.timezone,
+        "location_name": req.location_name,
+        "address": req.address,
+        "lat": req.lat,
+        "lng": req.lng,
+        "url": req.url,
+        "cost": req.cost,
+        "audience": req.audience.value,
+        "event_type": req.event_type.value,
+        "created_at": _stamp(),
+        "updated_at": _stamp(),
+    }
+
+
+_INSERTED = literal_column("(xmax = 0)", type_=Boolean).label("inserted")
+# uq_event_natural_key, minus agent_id.
+_NATURAL_KEY = tuple_(Event.title, Event.start_at, Event.lat, Event.lng)
+
+
+def _utc(start_at: datetime) -> datetime:
+    """Naive start_at is taken as UTC so it compares equal to the
+    timestamptz read back."""
+    return start_at if start_at.tzinfo else start_at.replace(tzinfo=timezone.utc)
+
+
+def _upsert(api_key_id, rows: List[dict], on_duplicate: str, columns: list):
+    """INSERT ... ON CONFLICT (natural key) that also selects the existing
+    rows it left alone, so every row comes back, new or not, without writing
+    a row version for a plain duplicate.
+
+    Result rows carry ``inserted`` and ``changed``. With on_duplicate=update
+    an existing row is only rewritten, and ``changed``, when some refreshed
+    column differs. ``xmax = 0`` only holds for freshly inserted tuples.
+
+    The second branch reads the statement's snapshot, so an existing row a
+    concurrent transaction committed while this one waited on it can be
+    missing; see _resolve_upsert.
+    """
+    stmt = pg_insert(Event).values(rows)
+    if on_duplicate == ON_DUPLICATE_UPDATE:
+        compared = [col for col in _UPSERT_UPDATE_COLUMNS if col != "updated_at"]
+        stmt = stmt.on_conflict_do_update(
+            constraint="uq_event_natural_key",
+            set_={col: stmt.excluded[col] for col in _UPSERT_UPDATE_COLUMNS},
+            where=tuple_(*(Event.__table__.c[col] for col in compared)).is_distinct_from(
+                tuple_(*(stmt.excluded[col] for col in compared))
+            ),
+        )
+    else:
+        stmt = stmt.on_conflict_do_nothing(constraint="uq_event_natural_key")
+    written = stmt.returning(*columns, _INSERTED, true().label("changed")).cte("written")
+    existing = (
+        select(*columns, false().label("inserted"), false().label("changed"))
+        .where(
+            Event.agent_id == api_key_id,
+            _NATURAL_KEY.in_([(r["title"], r["start_at"], r["lat"], r["lng"]) for r in rows]),
+            Event.event_id.not_in(select(written.c.event_id)),
+        )
     )
+    return union_all(select(written), existing)
+
+
+async def _resolve_upsert(db: AsyncSession, api_key_id, rows: List[dict], on_duplicate: str, columns: list) -> list:
+    """Run _upsert and return a row per natural key, re-reading any existing
+    row that committed after the statement's snapshot was taken."""
+    result = (await db.execute(_upsert(api_key_id, rows, on_duplicate, columns))).all()
+    if len(result) < len(rows):
+        found = {(r.title, r.start_at, r.lat, r.lng) for r in result}
+        missing = [
+            (r["title"], r["start_at"], r["lat"], r["lng"]) for r in rows
+            if (r["title"], _utc(r["start_at"]), r["lat"], r["lng"]) not in found
+        ]
+        late = await db.execute(
+            select(*columns, false().label("inserted"), false().label("changed"))
+            .where(Event.agent_id == api_key_id, _NATURAL_KEY.in_(missing))
+        )
+        result += late.all()
+    return result
+
+
+async def _adjust_event_counts(db: AsyncSession, deltas: Dict) -> None:
+    """Apply per-agent changes to api_keys.event_count in the caller's
+    transaction, so the counter commits or rolls back with the events. Rows
+    are locked in id order so concurrent multi-agent deletes cannot deadlock."""
+    for agent_id, delta in sorted(deltas.items(), key=lambda item: str(item[0])):
+        if delta:
+            await db.execute(
+                update(ApiKey)
+                .where(ApiKey.id == agent_id)
+                .values(event_count=ApiKey.event_count + delta)
+                .execution_options(synchronize_session=False)
+            )
 
 
 async def create_event(
     db: AsyncSession,
     api_key_id,
     req: EventCreate,
+    on_duplicate: str = ON_DUPLICATE_RETURN,
 ) -> EventResponse:
-    event_id = str(ULID())
-    now = datetime.now(timezone.utc)
-    event = Event(
-        event_id=event_id,
-        agent_id=api_key_id,
-        title=req.title,
-        description=req.description,
-        start_at=req.start_at,
-        end_at=req.end_at,
-        timezone=req.timezone,
-        location_name=req.location_name,
-        address=req.address,
-        lat=req.lat,
-        lng=req.lng,
-        url=req.url,
-        cost=req.cost,
-        audience=req.audience.value,
-        event_type=req.event_type.value,
-        created_at=now,
-        updated_at=now,
-    )
-    db.add(event)
-    try:
-        await db.flush()
-    except IntegrityError:
-        await db.rollback()
-        existing = await db.execute(
-            select(Event).where(
-                and_(
-                    Event.agent_id == api_key_id,
-                    Event.title == req.title,
-                    Event.start_at == req.start_at,
-                    Event.lat == req.lat,
-                    Event.lng == req.lng,
-                )
-            )
-        )
-        return _event_to_response(existing.scalar_one())
-    await db.refresh(event)
+    """Create an event, or resolve it to the agent's existing event with the
+    same natural key in the same statement. With on_duplicate=update the
+    existing event's other fields are overwritten from ``req`` if any differ."""
+    row = _event_row(api_key_id, req)
+    (event,) = await _resolve_upsert(db, api_key_id, [row], on_duplicate, _event_columns())
+    if event.inserted:
+        await _adjust_event_counts(db, {api_key_id: 1})
+    if event.changed:
+        kind = CHANGE_CREATE if event.inserted else CHANGE_UPDATE
+        await _publish(db, [Change(kind, event.event_id, event.lat, event.lng, event.event_type, event.audience)])
     return _event_to_response(event)
 
 
-async def get_event_by_id(db: AsyncSession, event_id: str) -> Optional[EventResponse]:
-    result = await db.execute(select(Event).where(Event.event_id == event_id))
-    event = result.scalar_one_or_none()
-    if event is None:
+def _natural_key(req: EventCreate) -> tuple:
+    """The uq_event_natural_key columns, minus agent_id."""
+    return (req.title, _utc(req.start_at), req.lat, req.lng)
+
+
+async def create_events_batch(
+    db: AsyncSession,
+    api_key_id,
+    reqs: List[EventCreate],
+    on_duplicate: str = ON_DUPLICATE_RETURN,
+) -> List[Tuple[str, BatchItemStatus]]:
+    """Insert or resolve many events in one multi-row upsert.
+
+    Returns (event_id, status) per request, in order: created, updated (an
+    existing event that on_duplicate=update changed) or duplicate. Repeats
+    of a natural key within the batch resolve to the first occurrence and are
+    reported as duplicate.
+    """
+    rows: Dict[tuple, dict] = {}
+    for req in reqs:
+        rows.setdefault(_natural_key(req), _event_row(api_key_id, req))
+
+    result = await _resolve_upsert(
+        db, api_key_id, list(rows.values()), on_duplicate,
+        [Event.event_id, Event.title, Event.start_at, Event.lat, Event.lng, Event.event_type, Event.audience],
+    )
+    resolved: Dict[tuple, Tuple[str, bool, bool]] = {}
+    changes: List[Change] = []
+    for r in result:
+        resolved[(r.title, r.start_at, r.lat, r.lng)] = (r.event_id, r.inserted, r.changed)
+        if r.changed:
+            kind = CHANGE_CREATE if r.inserted else CHANGE_UPDATE
+            changes.append(Change(kind, r.event_id, r.lat, r.lng, r.event_type, r.audience))
+    await _adjust_event_counts(db, {api_key_id: sum(1 for c in changes if c.kind == CHANGE_CREATE)})
+    await _publish(db, changes)
+
+    results: List[Tuple[str, BatchItemStatus]] = []
+    seen: set = set()
+    for req in reqs:
+        key = _natural_key(req)
+        event_id, inserted, changed = resolved[key]
+        if key in seen:
+            status = BatchItemStatus.DUPLICATE
+        elif inserted:
+            status = BatchItemStatus.CREATED
+        elif changed:
+            status = BatchItemStatus.UPDATED
+        else:
+            status = BatchItemStatus.DUPLICATE
+        results.append((event_id, status))
+        seen.add(key)
+    return results
+
+
+async def get_event_by_id(
+    db: AsyncSession, event_id: str, fields: Optional[Sequence[str]] = None
+) -> Optional[EventDict]:
+    result = await db.execute(select(*_event_columns(fields)).where(Event.event_id == event_id))
+    row = result.one_or_none()
+    if row is None:
         return None
-    return _event_to_response(event)
+    return _event_dict(row, fields=fields)
+
+
+AGENT_EVENTS_LIMIT_DEFAULT = 100
+AGENT_EVENTS_LIMIT_MAX = 500
+
+
+async def get_events_by_agent(
+    db: AsyncSession,
+    agent_id,
+    limit: int = AGENT_EVENTS_LIMIT_DEFAULT,
+    cursor: Optional[str] = None,
+) -> Tuple[List[EventDict], Optional[str]]:
+    """One page of an agent's events, newest first, read along
+    idx_events_agent_id_created_at. Returns (events, next_cursor)."""
+    stmt = select(*_event_columns()).where(Event.agent_id == agent_id)
+    if cursor is not None:
+        decoded = _decode_cursor(cursor)
+        if decoded.sort != CURSOR_AGENT:
+            raise ValueError("cursor: not an agent events cursor")
+        stmt = stmt.where(
+            tuple_(Event.created_at, Event.event_id)
+            < tuple_(literal(decoded.key, Event.created_at.type), literal(decoded.event_id, Event.event_id.type))
+        )
+    result = await db.execute(
+        stmt.order_by(Event.created_at.desc(), Event.event_id.desc()).limit(limit + 1)
+    )
+    rows = result.all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = _encode_cursor(CURSOR_AGENT, rows[-1].created_at, rows[-1].event_id)
+    return [_event_dict(row) for row in rows], next_cursor
+
+
+async def get_events_by_ids(
+    db: AsyncSession, event_ids: List[str], fields: Optional[Sequence[str]] = None
+) -> EventsByIdDict:
+    """Fetch many events in one query, preserving request order. Repeated ids
+    are returned once. The ids travel as a single array parameter, so the
+    statement text is the same for any number of ids."""
+    event_ids = list(dict.fromkeys(event_ids))
+    result = await db.execute(
+        select(*_event_columns(fields))
+        .where(Event.event_id == any_(bindparam("event_ids", event_ids, type_=ARRAY(String))))
+    )
+    found = {row.event_id: row for row in result}
+    return {
+        "events": [_event_dict(found[i], fields=fields) for i in event_ids if i in found],
+        "missing": [i for i in event_ids if i not in found],
+    }
+
+
+def _check_times(start_at: datetime, end_at: Optional[datetime], tz_name: str) -> None:
+    if end_at is None:
+        return
+    if end_at <= start_at:
+        raise ValueError("end_at must be after start_at")
+    if end_at <= datetime.now(timezone.utc):
+        raise ValueError("end_at must be in the future")
+    try:
+        tz = ZoneInfo(tz_name)
+        if start_at.astimezone(tz).date() != end_at.astimezone(tz).date():
+            raise ValueError(
+                "events cannot span multiple days: "
+                "end_at must be on the same date as start_at "
+                f"in {tz_name}"
+            )
+    except KeyError:
+        pass
 
 
 async def update_event(
@@ -118,6 +710,7 @@ async def update_event(
     event = result.scalar_one_or_none()
     if event is None or (not is_admin and event.agent_id != api_key_id):
         return None
+    old_point = (event.lat, event.lng)
 
     for field in req.model_fields_set:
         value = getattr(req, field)
@@ -125,25 +718,14 @@ async def update_event(
             value = value.value
         setattr(event, field, value)
 
-    if event.end_at is not None:
-        if event.end_at <= event.start_at:
-            raise ValueError("end_at must be after start_at")
-        if event.end_at <= datetime.now(timezone.utc):
-            raise ValueError("end_at must be in the future")
-        try:
-            tz = ZoneInfo(event.timezone)
-            if event.start_at.astimezone(tz).date() != event.end_at.astimezone(tz).date():
-                raise ValueError(
-                    "events cannot span multiple days: "
-                    "end_at must be on the same date as start_at "
-                    f"in {event.timezone}"
-                )
-        except KeyError:
-            pass
+    _check_times(event.start_at, event.end_at, event.timezone)
 
-    event.updated_at = datetime.now(timezone.utc)
+    event.updated_at = _stamp()
     await db.flush()
     await db.refresh(event)
+    await _publish(db, [
+        Change(CHANGE_UPDATE, event.event_id, event.lat, event.lng, event.event_type, event.audience, *old_point)
+    ])
     return _event_to_response(event)
 
 
@@ -160,76 +742,681 @@ async def delete_event(
         return False
     await db.delete(event)
     await db.flush()
+    await _record_deletes(db, [event])
     return True
 
 
-async def delete_events_by_agent(db: AsyncSession, agent_id) -> int:
+async def delete_events_by_agent(
+    db: AsyncSession,
+    agent_id,
+    limit: Optional[int] = None,
+    created_before: Optional[datetime] = None,
+) -> int:
+    """Delete the agent's events, or at most ``limit`` of them (oldest
+    first) so a purge can proceed in short transactions. ``created_before``
+    spares events created at or after that time."""
+    scope = [Event.agent_id == agent_id]
+    if created_before is not None:
+        scope.append(Event.created_at < created_before)
+    stmt = delete(Event).where(*scope)
+    if limit is not None:
+        batch = (
+            select(Event.event_id)
+            .where(*scope)
+            .order_by(Event.created_at, Event.event_id)
+            .limit(limit)
+            .scalar_subquery()
+        )
+        stmt = stmt.where(Event.event_id.in_(batch))
     result = await db.execute(
-        delete(Event).where(Event.agent_id == agent_id)
+        stmt.returning(Event.event_id, Event.agent_id, Event.lat, Event.lng)
     )
+    deleted = result.all()
     await db.flush()
-    return result.rowcount
+    await _record_deletes(db, deleted)
+    return len(deleted)
 
 
-async def get_events_nearby(
+async def _record_deletes(db: AsyncSession, deleted) -> None:
+    """Write tombstones for deleted events, decrement their agents' event
+    counts and publish the deletes. ``deleted`` items need event_id,
+    agent_id, lat and lng."""
+    if not deleted:
+        return
+    await db.execute(
+        pg_insert(EventTombstone)
+        .values([
+            {"event_id": d.event_id, "agent_id": d.agent_id, "lat": d.lat, "lng": d.lng, "deleted_at": _stamp()}
+            for d in deleted
+        ])
+        .on_conflict_do_nothing()
+    )
+    per_agent = Counter(d.agent_id for d in deleted)
+    await _adjust_event_counts(db, {agent_id: -n for agent_id, n in per_agent.items()})
+    await _publish(db, [Change(CHANGE_DELETE, d.event_id, d.lat, d.lng) for d in deleted])
+
+
+_TIME_FIELDS = {"start_at", "end_at", "timezone"}
+
+
+def _batch_scope(
+    api_key_id,
+    event_ids: Optional[List[str]],
+    filter: Optional[EventBatchFilter],
+    is_admin: bool,
+) -> List[ColumnElement]:
+    """WHERE clauses for a bulk update/delete. Admins may name any event by id;
+    a filter only ever matches the caller's own events."""
+    if event_ids is not None:
+        clauses = [Event.event_id.in_(event_ids)]
+        if not is_admin:
+            clauses.append(Event.agent_id == api_key_id)
+        return clauses
+
+    clauses = [Event.agent_id == api_key_id]
+    if filter.event_type:
+        clauses.append(Event.event_type.in_([t.value for t in filter.event_type]))
+    if filter.audience:
+        clauses.append(Event.audience.in_([a.value for a in filter.audience]))
+    if filter.title is not None:
+        clauses.append(Event.title == filter.title)
+    if filter.starts_after is not None:
+        clauses.append(Event.start_at >= filter.starts_after)
+    if filter.starts_before is not None:
+        clauses.append(Event.start_at < filter.starts_before)
+    return clauses
+
+
+def _not_found_ids(event_ids: Optional[List[str]], found: Iterable[str]) -> List[str]:
+    if event_ids is None:
+        return []
+    found = set(found)
+    return [i for i in dict.fromkeys(event_ids) if i not in found]
+
+
+async def update_events_batch(
     db: AsyncSession,
-    lat: float,
-    lng: float,
-    radius_miles: Optional[float] = None,
-    event_types: Optional[List[str]] = None,
-    audiences: Optional[List[str]] = None,
-    starts_after: Optional[datetime] = None,
-    starts_before: Optional[datetime] = None,
-    limit: int = NEARBY_LIMIT_DEFAULT,
-    cursor: Optional[str] = None,
-) -> Tuple[List[EventResponse], int, int, Optional[str]]:
-    now = datetime.now(timezone.utc)
+    api_key_id,
+    req: EventBatchUpdate,
+    *,
+    is_admin: bool = False,
+) -> EventBatchUpdateResponse:
+    """Apply ``req.changes`` to every selected event.
+
+    Changes that cannot break per-row invariants run as one UPDATE ... RETURNING.
+    Changes to start_at, end_at, timezone or location first lock and read the
+    selected rows, so times can be checked per event and the old locations
+    dropped from the nearby cache, then update exactly those rows.
+
+    Raises ValueError if any event would fail the time checks or collide with
+    another of the agent's events on the natural key; nothing is changed then.
+    """
+    changes = req.changes
+    values = {}
+    for field in changes.model_fields_set:
+        value = getattr(changes, field)
+        if field in ("audience", "event_type") and value is not None:
+            value = value.value
+        values[field] = value
+    scope = _batch_scope(api_key_id, req.event_ids, req.filter, is_admin)
+
+    old_points: Dict[str, Tuple[float, float]] = {}
+    if values.keys() & (_TIME_FIELDS | {"lat", "lng"}):
+        result = await db.execute(
+            select(Event.event_id, Event.start_at, Event.end_at, Event.timezone, Event.lat, Event.lng)
+            .where(*scope)
+            .with_for_update()
+        )
+        rows = result.all()
+        if values.keys() & _TIME_FIELDS:
+            for row in rows:
+                try:
+                    _check_times(
+                        values.get("start_at", row.start_at),
+                        values.get("end_at", row.end_at),
+                        values.get("timezone", row.timezone),
+                    )
+                except ValueError as e:
+                    raise ValueError(f"event {row.event_id}: {e}") from None
+        old_points = {row.event_id: (row.lat, row.lng) for row in rows}
+        scope = [Event.event_id.in_([row.event_id for row in rows])]
+
+    values["updated_at"] = _stamp()
+    try:
+        async with db.begin_nested():
+            result = await db.execute(
+                update(Event)
+                .where(*scope)
+                .values(**values)
+                .returning(Event.event_id, Event.lat, Event.lng, Event.event_type, Event.audience)
+                .execution_options(synchronize_session=False)
+            )
+            updated = result.all()
+    except IntegrityError:
+        raise ValueError(
+            "changes would give two of your events the same title, start_at, lat and lng"
+        ) from None
+
+    await _publish(db, [
+        Change(
+            CHANGE_UPDATE, row.event_id, row.lat, row.lng, row.event_type, row.audience,
+            *old_points.get(row.event_id, (None, None)),
+        )
+        for row in updated
+    ])
+    updated_ids = [row.event_id for row in updated]
+    return EventBatchUpdateResponse(
+        updated=updated_ids,
+        not_found=_not_found_ids(req.event_ids, updated_ids),
+        count=len(updated_ids),
+    )
+
+
+async def delete_events_batch(
+    db: AsyncSession,
+    api_key_id,
+    req: EventBatchDelete,
+    *,
+    is_admin: bool = False,
+) -> EventBatchDeleteResponse:
+    result = await db.execute(
+        delete(Event)
+        .where(*_batch_scope(api_key_id, req.event_ids, req.filter, is_admin))
+        .returning(Event.event_id, Event.agent_id, Event.lat, Event.lng)
+        .execution_options(synchronize_session=False)
+    )
+    deleted = result.all()
+    await _record_deletes(db, deleted)
+    deleted_ids = [row.event_id for row in deleted]
+    return EventBatchDeleteResponse(
+        deleted=deleted_ids,
+        not_found=_not_found_ids(req.event_ids, deleted_ids),
+        count=len(deleted_ids),
+    )
 
-    filters = [or_(Event.end_at.is_(None), Event.end_at >= now)]
 
+def _event_filters(
+    event_types: Optional[List[str]],
+    audiences: Optional[List[str]],
+    starts_after: Optional[datetime],
+    starts_before: Optional[datetime],
+) -> List[ColumnElement]:
+    """Non-spatial filters shared by nearby and export. Ended events are
+    always excluded."""
+    filters = [_EFFECTIVE_END >= datetime.now(timezone.utc)]
     if starts_after is not None:
         filters.append(Event.start_at >= starts_after)
     if starts_before is not None:
         filters.append(Event.start_at < starts_before)
-    if radius_miles is not None:
-        radius_m = radius_miles * MILES_TO_METERS
-        dlat = radius_m / METERS_PER_DEG_LAT
-        dlng = radius_m / (METERS_PER_DEG_LAT * math.cos(math.radians(lat)))
-        filters.append(Event.lat.between(lat - dlat, lat + dlat))
-        filters.append(Event.lng.between(lng - dlng, lng + dlng))
     if event_types:
         filters.append(Event.event_type.in_(event_types))
     if audiences:
         filters.append(Event.audience.in_(audiences))
+    return filters
 
-    total_result = await db.execute(
-        select(func.count()).select_from(Event).where(*filters)
-    )
-    total = total_result.scalar_one()
 
-    if cursor is not None:
-        cursor_start_at, cursor_event_id = _decode_cursor(cursor)
+async def _fetch_page(
+    db: AsyncSession,
+    spatial: _SpatialTerms,
+    filters: List[ColumnElement],
+    sort: str,
+    decoded: Optional[_Cursor],
+    limit: int,
+    columns: list,
+):
+    """Up to ``limit + 1`` rows after the cursor; the extra row signals a next page."""
+    sort_key = Event.start_at if sort == SORT_START_AT else spatial.order_key
+    filters = [*filters, *spatial.filters]
+    if decoded is not None:
+        # Row comparison rather than OR-expanded, so it is a single index range.
         filters.append(
-            or_(
-                Event.start_at > cursor_start_at,
-                and_(Event.start_at == cursor_start_at, Event.event_id > cursor_event_id),
-            )
+            tuple_(sort_key, Event.event_id)
+            > tuple_(literal(decoded.key, sort_key.type), literal(decoded.event_id, Event.event_id.type))
         )
-
     stmt = (
-        select(Event)
+        select(*columns, spatial.distance_miles.label("distance_miles"), sort_key.label("sort_key"))
         .where(*filters)
-        .order_by(Event.start_at.asc(), Event.event_id.asc())
+        .order_by(sort_key.asc(), Event.event_id.asc())
         .limit(limit + 1)
     )
     result = await db.execute(stmt)
-    rows = result.scalars().all()
+    return result.all()
+
+
+async def _fetch_nearest(
+    db: AsyncSession,
+    mode: str,
+    lat: float,
+    lng: float,
+    filters: List[ColumnElement],
+    decoded: Optional[_Cursor],
+    limit: int,
+    columns: list,
+):
+    """k-nearest-neighbour page without a radius.
+
+    PostGIS answers this directly from the GiST index. The point fallback
+    searches growing rings: once a ring holds more than ``limit`` matches,
+    nothing outside it can be closer, so no ring but the last one touches
+    more than a small area of the index.
+    """
+    if mode == SPATIAL_POSTGIS:
+        return await _fetch_page(
+            db, _spatial_terms(mode, lat, lng, None), filters, SORT_DISTANCE, decoded, limit, columns
+        )
+
+    radius = NEAREST_INITIAL_RADIUS_MILES + (decoded.key if decoded is not None else 0.0)
+    while True:
+        radius = min(radius, NEAREST_MAX_RADIUS_MILES)
+        rows = await _fetch_page(
+            db, _spatial_terms(mode, lat, lng, radius), filters, SORT_DISTANCE, decoded, limit, columns
+        )
+        if len(rows) > limit or radius >= NEAREST_MAX_RADIUS_MILES:
+            return rows
+        radius *= NEAREST_RING_GROWTH
+
+
+async def get_events_nearby(
+    db: AsyncSession,
+    lat: float,
+    lng: float,
+    radius_miles: Optional[float] = None,
+    event_types: Optional[List[str]] = None,
+    audiences: Optional[List[str]] = None,
+    starts_after: Optional[datetime] = None,
+    starts_before: Optional[datetime] = None,
+    limit: int = NEARBY_LIMIT_DEFAULT,
+    cursor: Optional[str] = None,
+    sort: Optional[str] = None,
+    include_total: Optional[bool] = None,
+    total_mode: str = TOTAL_EXACT,
+    fields: Optional[Sequence[str]] = None,
+) -> EventsNearbyDict:
+    """Events near (lat, lng). Without a radius, returns the nearest events by
+    distance. ``fields`` limits the columns read and the event fields set.
+
+    The total is counted only when ``include_total`` is true, which by default
+    means first pages of radius queries. Cursor pages reuse the total carried
+    in the cursor.
+
+    Raises ValueError for a malformed cursor, one issued for another sort, or
+    sort=start_at without a radius.
+    """
+    if radius_miles is None:
+        if sort == SORT_START_AT:
+            raise ValueError("sort: sort=start_at requires radius")
+        sort = SORT_DISTANCE
+    elif sort is None:
+        sort = SORT_START_AT
+
+    decoded = _decode_cursor(cursor) if cursor is not None else None
+    if decoded is not None and decoded.sort != sort:
+        raise ValueError(f"cursor: cursor was issued for sort={decoded.sort}")
+    if include_total is None:
+        include_total = decoded is None and radius_miles is not None
+
+    mode = await _get_spatial_mode(db)
+    filters = _event_filters(event_types, audiences, starts_after, starts_before)
+    spatial = _spatial_terms(mode, lat, lng, radius_miles)
+
+    cache_key = None
+    if nearby_cache.enabled:
+        if radius_miles is not None and sort == SORT_START_AT:
+            # start_at order does not depend on the point, so near-identical
+            # polls share rows fetched once for the whole snapped cell.
+            page = await _cell_page(
+                db, mode, lat, lng, radius_miles, filters, decoded, limit, fields,
+                include_total, total_mode,
+                (tuple(sorted(event_types or ())), tuple(sorted(audiences or ())), starts_after, starts_before),
+            )
+            if page is not None:
+                return page
+        else:
+            # Distance order and cursors depend on the exact point.
+            cache_key = (
+                lat, lng, radius_miles,
+                tuple(sorted(event_types or ())), tuple(sorted(audiences or ())),
+                starts_after, starts_before, limit, cursor, sort, include_total, total_mode,
+                None if fields is None else tuple(sorted(fields)),
+            )
+            cached = nearby_cache.get(cache_key)
+            if cached is not None:
+                return cached[1]
+
+    total, total_estimated = await _page_total(
+        db, [*filters, *spatial.filters], decoded, include_total, total_mode
+    )
+    columns = _event_columns(fields)
+    if radius_miles is None:
+        rows = await _fetch_nearest(db, mode, lat, lng, filters, decoded, limit, columns)
+    else:
+        rows = await _fetch_page(db, spatial, filters, sort, decoded, limit, columns)
 
     next_cursor: Optional[str] = None
     if len(rows) > limit:
         rows = rows[:limit]
         last = rows[-1]
-        next_cursor = _encode_cursor(last.start_at, last.event_id)
+        next_cursor = _encode_cursor(sort, last.sort_key, last.event_id, total, total_estimated)
+
+    events = [_event_dict(row, row.distance_miles, fields) for row in rows]
+    response: EventsNearbyDict = {
+        "events": events,
+        "count": len(events),
+        "total": total,
+        "total_estimated": total_estimated,
+        "next_cursor": next_cursor,
+    }
+    if cache_key is not None:
+        region_radius = radius_miles
+        if radius_miles is None:
+            # A full nearest page only changes if something lands closer than
+            # its farthest event; a partial page or a global total can change
+            # from a write anywhere.
+            if next_cursor is not None and not include_total:
+                region_radius = rows[-1].distance_miles
+        nearby_cache.set(cache_key, (_CacheRegion(lat, lng, region_radius), response))
+    return response
+
+
+async def _page_total(
+    db: AsyncSession,
+    filters: List[ColumnElement],
+    decoded: Optional[_Cursor],
+    include_total: bool,
+    total_mode: str,
+) -> Tuple[Optional[int], bool]:
+    if include_total:
+        return await _count(db, filters, total_mode), total_mode == TOTAL_ESTIMATE
+    if decoded is not None:
+        return decoded.total, decoded.total_estimated
+    return None, False
+
+
+async def _cell_page(
+    db: AsyncSession,
+    mode: str,
+    lat: float,
+    lng: float,
+    radius_miles: float,
+    filters: List[ColumnElement],
+    decoded: Optional[_Cursor],
+    limit: int,
+    fields: Optional[Sequence[str]],
+    include_total: bool,
+    total_mode: str,
+    filter_key: tuple,
+) -> Optional[EventsNearbyDict]:
+    """A sort=start_at radius page for (lat, lng) built from its snapped
+    cell's rows, or None when those rows cannot prove the page complete.
+
+    The cell's rows cover radius + _SNAP_SLACK_MILES around the cell center,
+    which contains the radius around any point in the cell. Filtering them to
+    the caller's radius gives exactly the caller's events in start_at order,
+    as long as more than ``limit`` survive or the cell has no rows beyond
+    them. The total, when asked for, is still counted for the caller's point.
+    """
+    precision = settings.nearby_cache_precision
+    center = (round(lat, precision), round(lng, precision))
+    position = None if decoded is None else (decoded.key, decoded.event_id)
+    key = (
+        "cell", *center, radius_miles, filter_key, limit, position,
+        None if fields is None else tuple(sorted(fields)),
+    )
+    cached = nearby_cache.get(key)
+    if cached is None:
+        cell_radius = radius_miles + _SNAP_SLACK_MILES
+        fetch_limit = limit * _CELL_FETCH_PAGES
+        columns = _event_columns(fields)
+        columns += [getattr(Event, c) for c in ("lat", "lng", "start_at") if c not in _projected(fields)]
+        rows = await _fetch_page(
+            db, _spatial_terms(mode, *center, cell_radius), filters, SORT_START_AT, decoded, fetch_limit, columns
+        )
+        cached = (_CacheRegion(*center, cell_radius), _CellRows(rows[:fetch_limit], len(rows) <= fetch_limit))
+        nearby_cache.set(key, cached)
+    cell: _CellRows = cached[1]
+
+    matches = []
+    for row in cell.rows:
+        distance = haversine_miles(lat, lng, row.lat, row.lng)
+        if distance <= radius_miles:
+            matches.append((row, distance))
+            if len(matches) > limit:
+                break
+    if len(matches) <= limit and not cell.exhausted:
+        return None
+
+    total, total_estimated = await _page_total(
+        db, [*filters, *_spatial_terms(mode, lat, lng, radius_miles).filters], decoded, include_total, total_mode
+    )
+    next_cursor: Optional[str] = None
+    if len(matches) > limit:
+        matches = matches[:limit]
+        last = matches[-1][0]
+        next_cursor = _encode_cursor(SORT_START_AT, last.start_at, last.event_id, total, total_estimated)
+    events = [_event_dict(row, distance, fields) for row, distance in matches]
+    return {
+        "events": events,
+        "count": len(events),
+        "total": total,
+        "total_estimated": total_estimated,
+        "next_cursor": next_cursor,
+    }
+
+
+CHANGES_LIMIT_DEFAULT = 100
+CHANGES_LIMIT_MAX = 1000
+
+
+def _after(ts_col, id_col, key: datetime, event_id: str) -> ColumnElement:
+    return tuple_(ts_col, id_col) > tuple_(literal(key, ts_col.type), literal(event_id, id_col.type))
+
+
+# Start of the oldest transaction in this database that has written and not
+# yet committed (it holds an xid), or now if there is none. Sessions of other
+# roles show a null xact_start, so every writer must connect as the app's role.
+_OLDEST_WRITER = text(
+    "SELECT least(clock_timestamp(), min(xact_start)) FROM pg_stat_activity "
+    "WHERE datname = current_database() AND backend_xid IS NOT NULL"
+)
+
+
+async def _changes_horizon(db: AsyncSession) -> datetime:
+    """The feed only serves changes stamped before this.
+
+    Every change is stamped by the database during its transaction, so a
+    write still uncommitted here will be stamped at or after its
+    transaction's start, however long it runs: everything below the oldest
+    open writer has committed. changes_settle_seconds covers the instant
+    between a transaction's first row being stamped and it taking an xid.
+    """
+    oldest = (await db.execute(_OLDEST_WRITER)).scalar_one()
+    return oldest - timedelta(seconds=settings.changes_settle_seconds)
+
+
+async def get_event_changes(
+    db: AsyncSession,
+    cursor: Optional[str] = None,
+    updated_since: Optional[datetime] = None,
+    limit: int = CHANGES_LIMIT_DEFAULT,
+) -> EventChangesResponse:
+    """Creates, updates and deletes in (changed_at, event_id) order, after
+    ``cursor`` or from ``updated_since`` (inclusive); with neither, from the
+    beginning. An event updated several times appears once, at its latest
+    position.
 
-    events = [_event_to_response(e) for e in rows]
-    return events, len(events), total, next_cursor
+    Changes are held back until every transaction that could still commit
+    an earlier one has finished; see _changes_horizon.
+
+    Raises ValueError for a malformed cursor, one from another endpoint, or
+    a position older than the tombstone retention (deletes since then may
+    have been pruned, so the client has to sync again from the beginning).
+    """
+    if cursor is not None:
+        decoded = _decode_cursor(cursor)
+        if decoded.sort != CURSOR_CHANGES:
+            raise ValueError("cursor: not a changes cursor")
+        key, after_id = decoded.key, decoded.event_id
+        field = "cursor"
+    elif updated_since is not None:
+        key, after_id = _utc(updated_since), ""
+        field = "updated_since"
+    else:
+        key, after_id = datetime.min.replace(tzinfo=timezone.utc), ""
+        field = None
+    if field is not None and settings.tombstone_retention_days > 0:
+        if key < datetime.now(timezone.utc) - timedelta(days=settings.tombstone_retention_days):
+            raise ValueError(
+                f"{field}: older than the {settings.tombstone_retention_days:g}-day delete history; "
+                "sync again from the beginning"
+            )
+    horizon = await _changes_horizon(db)
+
+    events = await db.execute(
+        select(*_event_columns(), Event.updated_at)
+        .where(_after(Event.updated_at, Event.event_id, key, after_id), Event.updated_at < horizon)
+        .order_by(Event.updated_at, Event.event_id)
+        .limit(limit + 1)
+    )
+    tombstones = await db.execute(
+        select(EventTombstone.event_id, EventTombstone.deleted_at)
+        .where(
+            _after(EventTombstone.deleted_at, EventTombstone.event_id, key, after_id),
+            EventTombstone.deleted_at < horizon,
+        )
+        .order_by(EventTombstone.deleted_at, EventTombstone.event_id)
+        .limit(limit + 1)
+    )
+    merged = heapq.merge(
+        (
+            EventChange(type=ChangeType.UPSERT, event_id=e.event_id, changed_at=e.updated_at, event=_event_to_response(e))
+            for e in events
+        ),
+        (
+            EventChange(type=ChangeType.DELETE, event_id=t.event_id, changed_at=t.deleted_at)
+            for t in tombstones
+        ),
+        key=lambda c: (c.changed_at, c.event_id),
+    )
+    changes = list(itertools.islice(merged, limit + 1))
+    has_more = len(changes) > limit
+    changes = changes[:limit]
+    if changes:
+        key, after_id = changes[-1].changed_at, changes[-1].event_id
+    if not has_more and horizon > key:
+        # Caught up: everything before the horizon has been served, so the
+        # cursor moves up to it and stays within the tombstone retention
+        # while the client keeps polling.
+        key, after_id = horizon, ""
+    return EventChangesResponse(
+        changes=changes,
+        count=len(changes),
+        next_cursor=_encode_cursor(CURSOR_CHANGES, key, after_id),
+        has_more=has_more,
+    )
+
+
+TOMBSTONE_PRUNE_INTERVAL_SECONDS = 3600.0
+TOMBSTONE_PRUNE_BATCH_SIZE = 10_000
+
+
+async def prune_tombstones() -> int:
+    """Delete tombstones older than tombstone_retention_days, a batch per
+    transaction. Returns how many were deleted."""
+    cutoff = datetime.now(timezone.utc) - timedelta(days=settings.tombstone_retention_days)
+    pruned = 0
+    while True:
+        async with async_session_factory() as db:
+            batch = (
+                select(EventTombstone.event_id)
+                .where(EventTombstone.deleted_at < cutoff)
+                .order_by(EventTombstone.deleted_at, EventTombstone.event_id)
+                .limit(TOMBSTONE_PRUNE_BATCH_SIZE)
+                .scalar_subquery()
+            )
+            result = await db.execute(delete(EventTombstone).where(EventTombstone.event_id.in_(batch)))
+            await db.commit()
+        pruned += result.rowcount
+        if result.rowcount < TOMBSTONE_PRUNE_BATCH_SIZE:
+            return pruned
+
+
+async def run_tombstone_pruner() -> None:
+    while True:
+        try:
+            await prune_tombstones()
+        except Exception:
+            logger.exception("Failed to prune event tombstones")
+        await asyncio.sleep(TOMBSTONE_PRUNE_INTERVAL_SECONDS)
+
+
+EXPORT_FETCH_SIZE = 500
+
+
+def export_events(
+    lat: Optional[float] = None,
+    lng: Optional[float] = None,
+    radius_miles: Optional[float] = None,
+    event_types: Optional[List[str]] = None,
+    audiences: Optional[List[str]] = None,
+    starts_after: Optional[datetime] = None,
+    starts_before: Optional[datetime] = None,
+    cursor: Optional[str] = None,
+) -> AsyncIterator[List[ExportItemDict]]:
+    """Every matching event in (start_at, event_id) order, in batches of up
+    to EXPORT_FETCH_SIZE ``{"cursor": ..., "event": {...}}`` items.
+
+    Passing an item's cursor back resumes after that event. Arguments are
+    checked here, before the response starts, so errors can still be
+    reported with a status code.
+
+    Raises ValueError for a malformed cursor, one from a distance-sorted
+    nearby query, or a partial lat/lng/radius.
+    """
+    if (lat is None, lng is None, radius_miles is None) not in ((True, True, True), (False, False, False)):
+        raise ValueError("radius: lat, lng and radius must be given together")
+    decoded = _decode_cursor(cursor) if cursor is not None else None
+    if decoded is not None and decoded.sort != SORT_START_AT:
+        raise ValueError(f"cursor: cursor was issued for sort={decoded.sort}")
+    return _export_stream(
+        lat, lng, radius_miles,
+        _event_filters(event_types, audiences, starts_after, starts_before),
+        decoded,
+    )
+
+
+async def _export_stream(
+    lat: Optional[float],
+    lng: Optional[float],
+    radius_miles: Optional[float],
+    filters: List[ColumnElement],
+    decoded: Optional[_Cursor],
+) -> AsyncIterator[List[ExportItemDict]]:
+    # The request's session is closed once the endpoint returns, before the
+    # body is sent, so the stream owns its own session and transaction.
+    async with async_session_factory() as db:
+        distance: ColumnElement = literal(None, Double)
+        if radius_miles is not None:
+            spatial = _spatial_terms(await _get_spatial_mode(db), lat, lng, radius_miles)
+            distance = spatial.distance_miles
+            filters = [*filters, *spatial.filters]
+        if decoded is not None:
+            filters = [
+                *filters,
+                tuple_(Event.start_at, Event.event_id)
+                > tuple_(literal(decoded.key, Event.start_at.type), literal(decoded.event_id, Event.event_id.type)),
+            ]
+
+        result = await db.stream(
+            select(*_event_columns(), distance.label("distance_miles"))
+            .where(*filters)
+            .order_by(Event.start_at, Event.event_id)
+            .execution_options(yield_per=EXPORT_FETCH_SIZE)
+        )
+        async for partition in result.partitions():
+            yield [
+                {
+                    "cursor": _encode_cursor(SORT_START_AT, row.start_at, row.event_id),
+                    "event": _event_dict(row, row.distance_miles),
+                }
+                for row in partition
+            ]
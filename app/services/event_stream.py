@@ -0,0 +1,225 @@
+"""Live event changes for /v1/events/stream.
+
+Each worker holds one LISTEN connection on CHANGES_CHANNEL. Notifications are
+matched against this worker's subscribers through a grid of lat/lng cells, so
+a change is only checked against subscriptions whose area could contain it.
+"""
+import asyncio
+import logging
+import math
+from typing import AsyncIterator, Dict, List, Optional, Set, Tuple
+
+import asyncpg
+from sqlalchemy.engine import make_url
+
+from app.config import settings
+from app.database import async_session_factory
+from app.schemas.event import event_json
+from app.services.event_service import (
+    CHANGE_DELETE,
+    CHANGES_CHANNEL,
+    Change,
+    get_events_by_ids,
+    invalidate_nearby,
+    nearby_cache,
+    unpack_changes,
+)
+from app.services.geo import bounding_boxes, haversine_miles
+
+logger = logging.getLogger(__name__)
+
+CELL_DEGREES = 1.0
+# Sent instead of queued changes when a subscriber may have missed some.
+RESET = "reset"
+
+_Cell = Tuple[int, int]
+
+
+def _cell(lat: float, lng: float) -> _Cell:
+    return (math.floor(lat / CELL_DEGREES), math.floor(lng / CELL_DEGREES))
+
+
+class Subscription:
+    def __init__(
+        self,
+        lat: float,
+        lng: float,
+        radius_miles: float,
+        event_types: Optional[List[str]] = None,
+        audiences: Optional[List[str]] = None,
+    ) -> None:
+        self.lat = lat
+        self.lng = lng
+        self.radius_miles = radius_miles
+        self.event_types = set(event_types) if event_types else None
+        self.audiences = set(audiences) if audiences else None
+        self.queue: "asyncio.Queue[Tuple[str, dict]]" = asyncio.Queue(settings.stream_queue_size)
+        self.cells: List[_Cell] = []
+        for box in bounding_boxes(lat, lng, radius_miles):
+            lat_lo, lng_lo = _cell(box.lat_min, box.lng_min)
+            lat_hi, lng_hi = _cell(box.lat_max, box.lng_max)
+            self.cells.extend(
+                (i, j) for i in range(lat_lo, lat_hi + 1) for j in range(lng_lo, lng_hi + 1)
+            )
+
+    def distance(self, lat: float, lng: float) -> Optional[float]:
+        """Distance in miles if (lat, lng) is inside the subscribed area."""
+        d = haversine_miles(self.lat, self.lng, lat, lng)
+        return d if d <= self.radius_miles else None
+
+    def wants(self, change: Change) -> bool:
+        return (self.event_types is None or change.event_type in self.event_types) and (
+            self.audiences is None or change.audience in self.audiences
+        )
+
+    def put(self, kind: str, data: dict) -> None:
+        try:
+            self.queue.put_nowait((kind, data))
+        except asyncio.QueueFull:
+            # A slow reader gets one reset in place of the backlog and is
+            # expected to re-query /nearby.
+            self.reset()
+
+    def reset(self) -> None:
+        while not self.queue.empty():
+            self.queue.get_nowait()
+        self.queue.put_nowait((RESET, {}))
+
+
+class ChangeHub:
+    def __init__(self) -> None:
+        self._cells: Dict[_Cell, Set[Subscription]] = {}
+        self._subscribers: Set[Subscription] = set()
+        self._inbox: "asyncio.Queue[str]" = asyncio.Queue()
+        self.listening = False
+
+    def __len__(self) -> int:
+        return len(self._subscribers)
+
+    def available(self) -> bool:
+        return self.listening and len(self._subscribers) < settings.stream_max_subscribers
+
+    def subscribe(self, sub: Subscription) -> None:
+        self._subscribers.add(sub)
+        for cell in sub.cells:
+            self._cells.setdefault(cell, set()).add(sub)
+
+    def unsubscribe(self, sub: Subscription) -> None:
+        self._subscribers.discard(sub)
+        for cell in sub.cells:
+            subs = self._cells.get(cell)
+            if subs is not None:
+                subs.discard(sub)
+                if not subs:
+                    del self._cells[cell]
+
+    def _candidates(self, lat: float, lng: float) -> Set[Subscription]:
+        return self._cells.get(_cell(lat, lng), set())
+
+    def _on_notify(self, connection, pid, channel, payload: str) -> None:
+        self._inbox.put_nowait(payload)
+
+    async def run(self) -> None:
+        """Keep a LISTEN connection open and dispatch notifications. Runs for
+        the life of the worker."""
+        dispatcher = asyncio.create_task(self._dispatch_loop())
+        dsn = make_url(settings.database_url).set(drivername="postgresql").render_as_string(hide_password=False)
+        connected_before = False
+        try:
+            while True:
+                try:
+                    conn = await asyncpg.connect(dsn)
+                except (OSError, asyncpg.PostgresError):
+                    logger.exception("LISTEN connection failed; retrying")
+                    await asyncio.sleep(5)
+                    continue
+                try:
+                    lost = asyncio.Event()
+                    conn.add_termination_listener(lambda _conn: lost.set())
+                    await conn.add_listener(CHANGES_CHANNEL, self._on_notify)
+                    if connected_before:
+                        # Changes made while disconnected were never seen here.
+                        nearby_cache.clear()
+                        for sub in self._subscribers:
+                            sub.reset()
+                    connected_before = True
+                    self.listening = True
+                    while not lost.is_set():
+                        try:
+                            await asyncio.wait_for(lost.wait(), settings.stream_heartbeat_seconds)
+                        except asyncio.TimeoutError:
+                            await conn.fetchval("SELECT 1", timeout=5)
+                except (OSError, asyncio.TimeoutError, asyncpg.PostgresError, asyncpg.InterfaceError):
+                    logger.exception("LISTEN connection lost; reconnecting")
+                finally:
+                    self.listening = False
+                    if not conn.is_closed():
+                        conn.terminate()
+                await asyncio.sleep(1)
+        finally:
+            dispatcher.cancel()
+
+    async def _dispatch_loop(self) -> None:
+        while True:
+            payload = await self._inbox.get()
+            try:
+                await self._dispatch(unpack_changes(payload))
+            except Exception:
+                logger.exception("Failed to dispatch event changes")
+
+    async def _dispatch(self, changes: List[Change]) -> None:
+        # Every committed write, this worker's own included; those were already
+        # evicted at commit, and evicting again is harmless.
+        invalidate_nearby(p for c in changes for p in c.points())
+        if not self._subscribers:
+            return
+
+        deliveries: List[Tuple[Subscription, str, str, Optional[float]]] = []
+        for change in changes:
+            matched: Set[Subscription] = set()
+            for sub in self._candidates(change.lat, change.lng):
+                distance = sub.distance(change.lat, change.lng)
+                if distance is not None and (change.kind == CHANGE_DELETE or sub.wants(change)):
+                    matched.add(sub)
+                    deliveries.append((sub, change.kind, change.event_id, distance))
+            if change.old_lat is not None:
+                # Moved out of an area: a delete as far as that subscriber is concerned.
+                for sub in self._candidates(change.old_lat, change.old_lng) - matched:
+                    if sub.distance(change.old_lat, change.old_lng) is not None and sub.wants(change):
+                        deliveries.append((sub, CHANGE_DELETE, change.event_id, None))
+
+        upserted = {event_id for _, kind, event_id, _ in deliveries if kind != CHANGE_DELETE}
+        events = {}
+        if upserted:
+            async with async_session_factory() as db:
+                found = await get_events_by_ids(db, list(upserted))
+            events = {e["event_id"]: e for e in found["events"]}
+
+        for sub, kind, event_id, distance in deliveries:
+            if kind == CHANGE_DELETE:
+                sub.put(kind, {"event_id": event_id})
+            elif event_id in events:
+                # Not found means it was deleted since; that delete follows.
+                sub.put(kind, {**events[event_id], "distance_miles": round(distance, 3)})
+
+    async def sse(self, sub: Subscription) -> AsyncIterator[str]:
+        """Server-sent events for one subscriber, with comment heartbeats."""
+        self.subscribe(sub)
+        try:
+            yield ": connected\n\n"
+            while True:
+                try:
+                    kind, data = await asyncio.wait_for(sub.queue.get(), settings.stream_heartbeat_seconds)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                yield f"event: {kind}\ndata: {event_json.dump_json(data).decode()}\n\n"
+        finally:
+            self.unsubscribe(sub)
+
+
+change_hub = ChangeHub()
+
+
+async def run_change_listener() -> None:
+    await change_hub.run()
@@ -0,0 +1,79 @@
+import math
+from typing import List, NamedTuple
+
+from sqlalchemy import Double, func, or_
+from sqlalchemy.sql.elements import ColumnElement
+
+EARTH_RADIUS_MILES = 3958.7613
+MILES_TO_METERS = 1609.34
+
+# Spatial access paths created by migration 005.
+SPATIAL_POSTGIS = "postgis"  # events.geog geography column, GiST index
+SPATIAL_POINT = "point"  # GiST index on point(lng, lat)
+
+
+class Box(NamedTuple):
+    lat_min: float
+    lat_max: float
+    lng_min: float
+    lng_max: float
+
+
+def bounding_boxes(lat: float, lng: float, radius_miles: float) -> List[Box]:
+    """Lat/lng boxes that together cover the spherical cap around (lat, lng).
+
+    Caps that reach a pole span every longitude; caps that cross the
+    antimeridian are split into two boxes so each stays in [-180, 180].
+    """
+    ang = radius_miles / EARTH_RADIUS_MILES
+    dlat = math.degrees(ang)
+    lat_min, lat_max = lat - dlat, lat + dlat
+    if lat_max >= 90.0 or lat_min <= -90.0:
+        return [Box(max(lat_min, -90.0), min(lat_max, 90.0), -180.0, 180.0)]
+
+    # Widest longitude extent of the cap, reached at lat' = asin(sin(lat)/cos(ang)).
+    dlng = math.degrees(math.asin(min(1.0, math.sin(ang) / math.cos(math.radians(lat)))))
+    lng_min, lng_max = lng - dlng, lng + dlng
+    if lng_max - lng_min >= 360.0:
+        return [Box(lat_min, lat_max, -180.0, 180.0)]
+    if lng_min < -180.0:
+        return [Box(lat_min, lat_max, lng_min + 360.0, 180.0), Box(lat_min, lat_max, -180.0, lng_max)]
+    if lng_max > 180.0:
+        return [Box(lat_min, lat_max, lng_min, 180.0), Box(lat_min, lat_max, -180.0, lng_max - 360.0)]
+    return [Box(lat_min, lat_max, lng_min, lng_max)]
+
+
+def point_sql(lat_col, lng_col) -> ColumnElement:
+    """``point(lng, lat)`` — must match the idx_events_point expression exactly."""
+    return func.point(lng_col, lat_col)
+
+
+def point_in_boxes(lat_col, lng_col, boxes: List[Box]) -> ColumnElement:
+    pt = point_sql(lat_col, lng_col)
+    clauses = [
+        pt.op("<@")(func.box(func.point(b.lng_min, b.lat_min), func.point(b.lng_max, b.lat_max)))
+        for b in boxes
+    ]
+    return clauses[0] if len(clauses) == 1 else or_(*clauses)
+
+
+def geography_point_sql(lat: float, lng: float) -> ColumnElement:
+    return func.geography(func.ST_SetSRID(func.ST_MakePoint(lng, lat), 4326))
+
+
+def haversine_miles(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    p1, p2 = math.radians(lat1), math.radians(lat2)
+    a = (
+        math.sin((p2 - p1) / 2) ** 2
+        + math.cos(p1) * math.cos(p2) * math.sin(math.radians(lng2 - lng1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_MILES * math.asin(min(1.0, math.sqrt(a)))
+
+
+def haversine_miles_sql(lat_col, lng_col, lat: float, lng: float) -> ColumnElement:
+    """SQL expression for the great-circle distance in miles from (lat, lng)."""
+    sin_half_dlat = func.sin(func.radians(lat_col - lat, type_=Double) * 0.5, type_=Double)
+    sin_half_dlng = func.sin(func.radians(lng_col - lng, type_=Double) * 0.5, type_=Double)
+    cos_lat = func.cos(func.radians(lat_col, type_=Double), type_=Double)
+    a = sin_half_dlat * sin_half_dlat + math.cos(math.radians(lat)) * cos_lat * sin_half_dlng * sin_half_dlng
+    return 2 * EARTH_RADIUS_MILES * func.asin(func.least(1.0, func.sqrt(a, type_=Double)), type_=Double)
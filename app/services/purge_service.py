@@ -0,0 +1,204 @@
+"""Background purges of an agent's events, and optionally of its key.
+
+An admin delete records a PurgeJob; deleting the agent also deactivates its
+key at once, so no new writes land meanwhile. An events-only purge leaves the
+key working and deletes only events created before the job. The worker loop
+started in the lifespan claims jobs and deletes purge_batch_size events per
+transaction, committing progress with each batch, so a job can be polled
+while it runs and is resumed by another worker if this one dies.
+"""
+import asyncio
+import logging
+from contextlib import suppress
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from sqlalchemy import and_, delete, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.database import async_session_factory
+from app.models.api_key import ApiKey
+from app.models.purge_job import PurgeJob
+from app.services.auth_service import invalidate_api_key
+from app.services.event_service import delete_events_by_agent
+
+logger = logging.getLogger(__name__)
+
+PURGE_PENDING = "pending"
+PURGE_RUNNING = "running"
+PURGE_DONE = "done"
+PURGE_FAILED = "failed"
+_UNFINISHED = (PURGE_PENDING, PURGE_RUNNING)
+
+_wake = asyncio.Event()
+
+
+async def start_purge(db: AsyncSession, agent: ApiKey, delete_agent: bool) -> PurgeJob:
+    """Queue a purge, and with ``delete_agent`` deactivate the key, in the
+    caller's transaction.
+
+    An unfinished job for the agent is reused; asking to delete the agent
+    upgrades an events-only job.
+    """
+    # Serialise concurrent purge requests for the same agent, and read the
+    # key's state under that lock. The key row is locked before the job row
+    # here and in the worker (see _lock_agent).
+    locked = await db.execute(
+        select(ApiKey.is_active, ApiKey.event_count).where(ApiKey.id == agent.id).with_for_update()
+    )
+    key = locked.one()
+    result = await db.execute(
+        select(PurgeJob)
+        .where(PurgeJob.agent_id == agent.id, PurgeJob.status.in_(_UNFINISHED))
+        .with_for_update()
+    )
+    job = result.scalar_one_or_none()
+    if job is None:
+        job = PurgeJob(
+            agent_id=agent.id,
+            delete_agent=delete_agent,
+            was_active=key.is_active,
+            status=PURGE_PENDING,
+            total=key.event_count,
+            deleted=0,
+        )
+        db.add(job)
+    elif delete_agent and not job.delete_agent:
+        job.delete_agent = True
+        job.was_active = key.is_active
+        job.total = job.deleted + key.event_count
+    if delete_agent:
+        await db.execute(update(ApiKey).where(ApiKey.id == agent.id).values(is_active=False))
+    await db.flush()
+    await db.refresh(job)
+    if delete_agent:
+        invalidate_api_key(agent.id)
+    return job
+
+
+async def get_purge_job(db: AsyncSession, job_id) -> Optional[PurgeJob]:
+    result = await db.execute(select(PurgeJob).where(PurgeJob.id == job_id))
+    return result.scalar_one_or_none()
+
+
+def wake_purge_worker() -> None:
+    """Have this worker look for jobs now instead of at its next poll."""
+    _wake.set()
+
+
+async def _claim():
+    """Take the oldest pending job, or a running one whose worker went quiet."""
+    now = datetime.now(timezone.utc)
+    stale = now - timedelta(seconds=settings.purge_stale_seconds)
+    candidate = (
+        select(PurgeJob.id)
+        .where(
+            or_(
+                PurgeJob.status == PURGE_PENDING,
+                and_(PurgeJob.status == PURGE_RUNNING, PurgeJob.updated_at < stale),
+            )
+        )
+        .order_by(PurgeJob.created_at)
+        .limit(1)
+        .with_for_update(skip_locked=True)
+        .scalar_subquery()
+    )
+    async with async_session_factory() as db:
+        result = await db.execute(
+            update(PurgeJob)
+            .where(PurgeJob.id == candidate)
+            .values(status=PURGE_RUNNING, updated_at=now)
+            .returning(PurgeJob.id, PurgeJob.agent_id)
+        )
+        claimed = result.one_or_none()
+        await db.commit()
+    return claimed
+
+
+async def _purge_batch(job_id, agent_id) -> int:
+    async with async_session_factory() as db:
+        # Re-read each batch: an events-only job may have been upgraded to
+        # delete the agent, which drops the created_at cutoff.
+        result = await db.execute(select(PurgeJob.delete_agent, PurgeJob.created_at).where(PurgeJob.id == job_id))
+        job = result.one()
+        deleted = await delete_events_by_agent(
+            db,
+            agent_id,
+            limit=settings.purge_batch_size,
+            created_before=None if job.delete_agent else job.created_at,
+        )
+        await db.execute(
+            update(PurgeJob)
+            .where(PurgeJob.id == job_id)
+            .values(deleted=PurgeJob.deleted + deleted, updated_at=datetime.now(timezone.utc))
+        )
+        await db.commit()
+    return deleted
+
+
+async def _lock_agent(db: AsyncSession, agent_id) -> None:
+    """Lock the agent's key row. Anything that locks both rows takes this one
+    before the job's, the order start_purge uses."""
+    await db.execute(select(ApiKey.id).where(ApiKey.id == agent_id).with_for_update())
+
+
+async def _finish(job_id, agent_id) -> None:
+    async with async_session_factory() as db:
+        # Locked so a concurrent start_purge either lands its delete_agent
+        # upgrade first or sees the job finished and queues a new one.
+        await _lock_agent(db, agent_id)
+        result = await db.execute(select(PurgeJob).where(PurgeJob.id == job_id).with_for_update())
+        job = result.scalar_one()
+        if job.delete_agent:
+            # Anything a racing request wrote before the deactivation took hold.
+            job.deleted += await delete_events_by_agent(db, agent_id)
+            await db.execute(delete(ApiKey).where(ApiKey.id == agent_id))
+        now = datetime.now(timezone.utc)
+        job.status = PURGE_DONE
+        job.updated_at = now
+        job.finished_at = now
+        await db.commit()
+    invalidate_api_key(agent_id)
+
+
+async def _run(job_id, agent_id) -> None:
+    try:
+        while await _purge_batch(job_id, agent_id) >= settings.purge_batch_size:
+            pass
+        await _finish(job_id, agent_id)
+    except Exception as e:
+        logger.exception("Purge job %s failed", job_id)
+        try:
+            async with async_session_factory() as db:
+                await _lock_agent(db, agent_id)
+                result = await db.execute(select(PurgeJob).where(PurgeJob.id == job_id).with_for_update())
+                job = result.scalar_one()
+                if job.delete_agent and job.was_active:
+                    # Hand the key back rather than leave a live agent locked
+                    # out; deleting it again queues a fresh job.
+                    await db.execute(update(ApiKey).where(ApiKey.id == agent_id).values(is_active=True))
+                now = datetime.now(timezone.utc)
+                job.status = PURGE_FAILED
+                job.error = str(e)
+                job.updated_at = now
+                job.finished_at = now
+                await db.commit()
+        except Exception:
+            # Left running: it is reclaimed once purge_stale_seconds pass.
+            logger.exception("Failed to record purge job %s as failed", job_id)
+
+
+async def run_purge_worker() -> None:
+    while True:
+        _wake.clear()
+        try:
+            claimed = await _claim()
+        except Exception:
+            logger.exception("Failed to claim a purge job")
+            claimed = None
+        if claimed is not None:
+            await _run(claimed.id, claimed.agent_id)
+            continue
+        with suppress(asyncio.TimeoutError):
+            await asyncio.wait_for(_wake.wait(), settings.purge_poll_seconds)
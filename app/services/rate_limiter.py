@@ -0,0 +1,103 @@
+import math
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Callable, Dict, Tuple
+
+from app.config import settings
+
+
+@dataclass(frozen=True)
+class RateLimitDecision:
+    allowed: bool
+    limit: int
+    remaining: int
+    retry_after: float  # seconds until one token is available (0 when allowed)
+    reset_after: float  # seconds until the bucket is full again
+
+
+class RateLimitBackend(ABC):
+    """Token-bucket store. Implementations backed by a shared store (e.g. Redis)
+    make limits hold across workers; the in-memory one is per process."""
+
+    @abstractmethod
+    async def acquire(self, key: str, capacity: int, refill_per_second: float) -> RateLimitDecision:
+        ...
+
+
+class InMemoryRateLimitBackend(RateLimitBackend):
+    PRUNE_EVERY = 1024
+    # Reported retry/reset for a bucket that never refills (rate_limit <= 0).
+    BLOCKED_RETRY_SECONDS = 3600.0
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic) -> None:
+        self._clock = clock
+        # key -> (tokens, last refill time, time the bucket will be full)
+        self._buckets: Dict[str, Tuple[float, float, float]] = {}
+        self._ops = 0
+
+    async def acquire(self, key: str, capacity: int, refill_per_second: float) -> RateLimitDecision:
+        if capacity <= 0 or refill_per_second <= 0:
+            # A key with no budget is always blocked; there is nothing to track.
+            return RateLimitDecision(
+                allowed=False,
+                limit=max(capacity, 0),
+                remaining=0,
+                retry_after=self.BLOCKED_RETRY_SECONDS,
+                reset_after=self.BLOCKED_RETRY_SECONDS,
+            )
+        now = self._clock()
+        tokens, updated, _ = self._buckets.get(key, (float(capacity), now, now))
+        tokens = min(float(capacity), tokens + (now - updated) * refill_per_second)
+
+        allowed = tokens >= 1.0
+        if allowed:
+            tokens -= 1.0
+        reset_after = (capacity - tokens) / refill_per_second
+        self._buckets[key] = (tokens, now, now + reset_after)
+
+        self._ops += 1
+        if self._ops % self.PRUNE_EVERY == 0:
+            self._prune(now)
+
+        return RateLimitDecision(
+            allowed=allowed,
+            limit=capacity,
+            remaining=int(tokens),
+            retry_after=0.0 if allowed else (1.0 - tokens) / refill_per_second,
+            reset_after=reset_after,
+        )
+
+    def _prune(self, now: float) -> None:
+        # A bucket that has refilled completely carries no state.
+        for key in [k for k, (_, _, full_at) in self._buckets.items() if full_at <= now]:
+            del self._buckets[key]
+
+
+_backend: RateLimitBackend = InMemoryRateLimitBackend()
+
+
+def get_rate_limit_backend() -> RateLimitBackend:
+    return _backend
+
+
+def set_rate_limit_backend(backend: RateLimitBackend) -> None:
+    global _backend
+    _backend = backend
+
+
+async def check_rate_limit(key_id, rate_limit: int) -> RateLimitDecision:
+    """Take one token from the key's bucket. ``rate_limit`` is requests per window."""
+    window = settings.rate_limit_window_seconds
+    return await _backend.acquire(str(key_id), rate_limit, rate_limit / window)
+
+
+def rate_limit_headers(decision: RateLimitDecision) -> Dict[str, str]:
+    headers = {
+        "X-RateLimit-Limit": str(decision.limit),
+        "X-RateLimit-Remaining": str(decision.remaining),
+        "X-RateLimit-Reset": str(math.ceil(decision.reset_after)),
+    }
+    if not decision.allowed:
+        headers["Retry-After"] = str(max(1, math.ceil(decision.retry_after)))
+    return headers
@@ -0,0 +1,94 @@
+"""Serialisation cost of one 100-event nearby page.
+
+Compares the previous path (build EventResponse models, let FastAPI validate
+them against response_model again and encode with the stdlib json module)
+with the dict + TypeAdapter fast path used by the routes now. Both must
+produce byte-identical bodies.
+
+    python -m benchmarks.serialization
+"""
+import asyncio
+import timeit
+import uuid
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from app.schemas.event import EventResponse, EventsNearbyResponse, events_nearby_json
+from app.services.event_service import _event_dict
+
+PAGE = 100
+ROUNDS = 500
+
+
+def _rows():
+    start = datetime(2026, 3, 15, 18, tzinfo=timezone.utc)
+    return [
+        SimpleNamespace(
+            event_id=f"01JAXYZ1234567890ABCDE{i:04d}",
+            agent_id=uuid.uuid4(),
+            title="Tech Meetup",
+            description="Monthly gathering for local developers to share projects and ideas. " * 15,
+            start_at=start + timedelta(hours=i),
+            end_at=start + timedelta(hours=i + 2),
+            timezone="America/Los_Angeles",
+            location_name="Community Center",
+            address="123 Main St, San Francisco, CA 94105",
+            lat=37.7749 + i / 1000,
+            lng=-122.4194,
+            url="https://example.com/tech-meetup",
+            cost="Free",
+            audience="adults",
+            event_type="meetup",
+            created_at=start - timedelta(days=14),
+            distance_miles=i * 0.0731,
+        )
+        for i in range(PAGE)
+    ]
+
+
+def main() -> None:
+    rows = _rows()
+    field = create_model_field(name="Response_nearby", type_=EventsNearbyResponse, mode="serialization")
+    loop = asyncio.new_event_loop()
+
+    def before() -> bytes:
+        page = EventsNearbyResponse(
+            events=[EventResponse(**_event_dict(r, r.distance_miles)) for r in rows],
+            count=PAGE,
+            total=PAGE,
+            total_estimated=False,
+            next_cursor="eyJzIjoic3RhcnRfYXQifQ==",
+        )
+        content = loop.run_until_complete(
+            serialize_response(field=field, response_content=page, is_coroutine=True)
+        )
+        return JSONResponse(content).body
+
+    def after() -> bytes:
+        events = [_event_dict(r, r.distance_miles) for r in rows]
+        return events_nearby_json.dump_json(
+            {
+                "events": events,
+                "count": PAGE,
+                "total": PAGE,
+                "total_estimated": False,
+                "next_cursor": "eyJzIjoic3RhcnRfYXQifQ==",
+            }
+        )
+
+    assert before() == after(), "fast path changed the wire format"
+
+    results = {}
+    for name, fn in (("before", before), ("after", after)):
+        results[name] = min(timeit.repeat(fn, number=ROUNDS, repeat=5)) / ROUNDS * 1000
+        print(f"{name:>6}: {results[name]:.3f} ms per {PAGE}-event page")
+    print(f"speedup: {results['before'] / results['after']:.1f}x, {len(after())} bytes, identical output")
+    loop.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+"""Admin ID token verification against a local stand-in for Google's key set."""
+import json
+import time
+from datetime import datetime, timedelta, timezone
+
+import jwt
+import pytest
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from cryptography.x509.oid import NameOID
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+
+from app.dependencies.admin_auth import require_admin
+from app.services import admin_auth_service
+from app.services.admin_auth_service import (
+    KEY_REFETCH_MIN_SECONDS,
+    FirebaseKeySet,
+    get_firebase_key_set,
+    set_firebase_key_set,
+    verified_token_cache,
+)
+
+PROJECT_ID = "meetspace-test"
+
+
+def _signing_key():
+    """An RSA key and a self-signed certificate PEM for it."""
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "securetoken")])
+    now = datetime.now(timezone.utc)
+    cert = (
+        x509.CertificateBuilder()
+        .subject_name(name)
+        .issuer_name(name)
+        .public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now - timedelta(days=1))
+        .not_valid_after(now + timedelta(days=1))
+        .sign(key, hashes.SHA256())
+    )
+    return key, cert.public_bytes(serialization.Encoding.PEM).decode()
+
+
+KEYS = {kid: _signing_key() for kid in ("k1", "k2")}
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _token(kid: str = "k1", **claims) -> str:
+    now = int(time.time())
+    payload = {
+        "iss": f"https://securetoken.google.com/{PROJECT_ID}",
+        "aud": PROJECT_ID,
+        "sub": "admin-uid",
+        "email": "admin@example.com",
+        "iat": now,
+        "auth_time": now,
+        "exp": now + 3600,
+        **claims,
+    }
+    return jwt.encode(payload, KEYS[kid][0], algorithm="RS256", headers={"kid": kid})
+
+
+def _publish_certs(path, *kids) -> None:
+    path.write_text(json.dumps({kid: KEYS[kid][1] for kid in kids}))
+
+
+@pytest.fixture
+def certs_file(tmp_path):
+    return tmp_path / "certs.json"
+
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+
+@pytest.fixture
+def key_set(certs_file, clock, monkeypatch):
+    """A key set holding k1, installed with load(); refetches read certs_file."""
+    key_set = FirebaseKeySet(certs_file.as_uri(), clock=clock)
+    key_set.load({"k1": KEYS["k1"][1]}, max_age=3600)
+    fetches = []
+    fetch = key_set._fetch
+
+    def counted_fetch():
+        fetches.append(clock())
+        return fetch()
+
+    monkeypatch.setattr(key_set, "_fetch", counted_fetch)
+    key_set.fetches = fetches
+    monkeypatch.setattr(admin_auth_service, "_project_id", PROJECT_ID)
+    previous = get_firebase_key_set()
+    set_firebase_key_set(key_set)
+    yield key_set
+    set_firebase_key_set(previous)
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+
+    @app.get("/whoami")
+    async def whoami(claims: dict = Depends(require_admin)):
+        return claims
+
+    return TestClient(app)
+
+
+def _get(client, token: str):
+    return client.get("/whoami", headers={"Authorization": f"Bearer {token}"})
+
+
+def test_valid_token_is_verified_then_served_from_cache(client, key_set):
+    token = _token()
+    resp = _get(client, token)
+    assert resp.status_code == 200
+    assert resp.json()["uid"] == "admin-uid"
+    assert resp.json()["email"] == "admin@example.com"
+
+    hits = verified_token_cache.stats()["hits"]
+    key_set.load({}, max_age=3600)  # a re-verification would now fail
+    assert _get(client, token).status_code == 200
+    assert verified_token_cache.stats()["hits"] == hits + 1
+    assert key_set.fetches == []
+
+
+@pytest.mark.parametrize(
+    "claims",
+    [
+        {"aud": "another-project"},
+        {"iss": "https://securetoken.google.com/another-project"},
+        {"iss": "https://accounts.google.com"},
+    ],
+)
+def test_wrong_audience_or_issuer_is_rejected(client, key_set, claims):
+    assert _get(client, _token(**claims)).status_code == 401
+
+
+def test_expired_token_is_rejected(client, key_set):
+    now = int(time.time())
+    token = _token(iat=now - 7200, auth_time=now - 7200, exp=now - 3600)
+    assert _get(client, token).status_code == 401
+
+
+def test_unknown_kid_triggers_one_refetch(client, key_set, clock, certs_file):
+    _publish_certs(certs_file, "k1", "k2")
+    clock.now += KEY_REFETCH_MIN_SECONDS
+
+    assert _get(client, _token(kid="k2")).status_code == 200
+    assert len(key_set.fetches) == 1
+
+    # Still unknown after the refetch: rejected without fetching again.
+    forged = jwt.encode({"sub": "x"}, KEYS["k2"][0], algorithm="RS256", headers={"kid": "k3"})
+    assert _get(client, forged).status_code == 401
+    assert len(key_set.fetches) == 1
+
+
+def test_keys_past_max_age_fail_closed(client, key_set, clock, certs_file):
+    key_set.load({"k1": KEYS["k1"][1]}, max_age=10)
+    clock.now += 11
+
+    # The refetch fails (nothing published), and the stale k1 is not used.
+    assert _get(client, _token()).status_code == 401
+    assert len(key_set.fetches) == 1
+
+    # Within the refetch interval the keys stay unusable, with no new fetch.
+    _publish_certs(certs_file, "k1")
+    assert _get(client, _token()).status_code == 401
+    assert len(key_set.fetches) == 1
+
+    clock.now += KEY_REFETCH_MIN_SECONDS
+    assert _get(client, _token()).status_code == 200
+    assert len(key_set.fetches) == 2
+
+
+def test_failed_fetch_is_401(client, clock, certs_file, monkeypatch):
+    monkeypatch.setattr(admin_auth_service, "_project_id", PROJECT_ID)
+    previous = get_firebase_key_set()
+    set_firebase_key_set(FirebaseKeySet(certs_file.as_uri(), clock=clock))
+    try:
+        assert _get(client, _token()).status_code == 401
+    finally:
+        set_firebase_key_set(previous)
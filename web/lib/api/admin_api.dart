@@ -3,7 +3,6 @@ import 'dart:convert';
 import 'package:http/http.dart' as http;
 
 import '../models/admin.dart';
-import '../models/event.dart';
 import 'config.dart';
 
 class AdminApiClient {
@@ -26,9 +25,17 @@ class AdminApiClient {
 
   String _url(String path) => '$_baseUrl$path';
 
-  Future<AdminAgentListResponse> getAgents() async {
-    final url = _url('/v1/admin/agents');
-    final r = await http.get(Uri.parse(url), headers: _headers);
+  Future<AdminAgentListResponse> getAgents({
+    String? cursor,
+    String? search,
+    int? limit,
+  }) async {
+    final uri = Uri.parse(_url('/v1/admin/agents')).replace(queryParameters: {
+      if (cursor != null) 'cursor': cursor,
+      if (search != null && search.isNotEmpty) 'search': search,
+      if (limit != null) 'limit': '$limit',
+    });
+    final r = await http.get(uri, headers: _headers);
     if (r.statusCode == 200) {
       return AdminAgentListResponse.fromJson(
           jsonDecode(r.body) as Map<String, dynamic>);
@@ -36,14 +43,20 @@ class AdminApiClient {
     throw Exception(_extractError(r));
   }
 
-  Future<List<EventResponse>> getAgentEvents(String agentId) async {
-    final url = _url('/v1/admin/agents/$agentId/events');
-    final r = await http.get(Uri.parse(url), headers: _headers);
+  Future<AdminAgentEventsPage> getAgentEvents(
+    String agentId, {
+    String? cursor,
+    int? limit,
+  }) async {
+    final uri = Uri.parse(_url('/v1/admin/agents/$agentId/events'))
+        .replace(queryParameters: {
+      if (cursor != null) 'cursor': cursor,
+      if (limit != null) 'limit': '$limit',
+    });
+    final r = await http.get(uri, headers: _headers);
     if (r.statusCode == 200) {
-      final data = jsonDecode(r.body) as Map<String, dynamic>;
-      return (data['events'] as List)
-          .map((e) => EventResponse.fromJson(e as Map<String, dynamic>))
-          .toList();
+      return AdminAgentEventsPage.fromJson(
+          jsonDecode(r.body) as Map<String, dynamic>);
     }
     throw Exception(_extractError(r));
   }
@@ -56,20 +69,31 @@ class AdminApiClient {
     }
   }
 
-  Future<void> deleteAgentEvents(String agentId) async {
+  Future<PurgeJob> deleteAgentEvents(String agentId) async {
     final url = _url('/v1/admin/agents/$agentId/events');
     final r = await http.delete(Uri.parse(url), headers: _headers);
-    if (r.statusCode != 204) {
-      throw Exception(_extractError(r));
+    if (r.statusCode == 202) {
+      return PurgeJob.fromJson(jsonDecode(r.body) as Map<String, dynamic>);
     }
+    throw Exception(_extractError(r));
   }
 
-  Future<void> deleteAgent(String agentId) async {
+  Future<PurgeJob> deleteAgent(String agentId) async {
     final url = _url('/v1/admin/agents/$agentId');
     final r = await http.delete(Uri.parse(url), headers: _headers);
-    if (r.statusCode != 204) {
-      throw Exception(_extractError(r));
+    if (r.statusCode == 202) {
+      return PurgeJob.fromJson(jsonDecode(r.body) as Map<String, dynamic>);
+    }
+    throw Exception(_extractError(r));
+  }
+
+  Future<PurgeJob> getJob(String jobId) async {
+    final url = _url('/v1/admin/jobs/$jobId');
+    final r = await http.get(Uri.parse(url), headers: _headers);
+    if (r.statusCode == 200) {
+      return PurgeJob.fromJson(jsonDecode(r.body) as Map<String, dynamic>);
     }
+    throw Exception(_extractError(r));
   }
 
   String _extractError(http.Response r) {
@@ -1,3 +1,5 @@
+import 'event.dart';
+
 class AdminAgent {
   final String id;
   final String email;
@@ -38,8 +40,13 @@ class AdminAgent {
 class AdminAgentListResponse {
   final List<AdminAgent> agents;
   final int total;
+  final String? nextCursor;
 
-  AdminAgentListResponse({required this.agents, required this.total});
+  AdminAgentListResponse({
+    required this.agents,
+    required this.total,
+    this.nextCursor,
+  });
 
   factory AdminAgentListResponse.fromJson(Map<String, dynamic> json) {
     return AdminAgentListResponse(
@@ -47,6 +54,63 @@ class AdminAgentListResponse {
           .map((e) => AdminAgent.fromJson(e as Map<String, dynamic>))
           .toList(),
       total: json['total'] as int,
+      nextCursor: json['next_cursor'] as String?,
+    );
+  }
+}
+
+class AdminAgentEventsPage {
+  final AdminAgent agent;
+  final List<EventResponse> events;
+  final String? nextCursor;
+
+  AdminAgentEventsPage({
+    required this.agent,
+    required this.events,
+    this.nextCursor,
+  });
+
+  factory AdminAgentEventsPage.fromJson(Map<String, dynamic> json) {
+    return AdminAgentEventsPage(
+      agent: AdminAgent.fromJson(json['agent'] as Map<String, dynamic>),
+      events: (json['events'] as List)
+          .map((e) => EventResponse.fromJson(e as Map<String, dynamic>))
+          .toList(),
+      nextCursor: json['next_cursor'] as String?,
+    );
+  }
+}
+
+class PurgeJob {
+  final String id;
+  final String agentId;
+  final bool deleteAgent;
+  final String status;
+  final int total;
+  final int deleted;
+  final String? error;
+
+  PurgeJob({
+    required this.id,
+    required this.agentId,
+    required this.deleteAgent,
+    required this.status,
+    required this.total,
+    required this.deleted,
+    this.error,
+  });
+
+  bool get isFinished => status == 'done' || status == 'failed';
+
+  factory PurgeJob.fromJson(Map<String, dynamic> json) {
+    return PurgeJob(
+      id: json['id'] as String,
+      agentId: json['agent_id'] as String,
+      deleteAgent: json['delete_agent'] as bool,
+      status: json['status'] as String,
+      total: json['total'] as int,
+      deleted: json['deleted'] as int,
+      error: json['error'] as String?,
     );
   }
 }
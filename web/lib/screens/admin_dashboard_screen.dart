@@ -19,12 +19,19 @@ class AdminDashboardScreen extends StatefulWidget {
 class _AdminDashboardScreenState extends State<AdminDashboardScreen> {
   AdminApiClient? _client;
   List<AdminAgent>? _agents;
+  int _total = 0;
+  String? _nextCursor;
+  String _search = '';
   bool _loading = true;
+  bool _loadingMore = false;
   String? _error;
 
   String? _expandedAgentId;
   List<EventResponse>? _expandedEvents;
+  int _expandedEventCount = 0;
+  String? _expandedEventsCursor;
   bool _eventsLoading = false;
+  bool _eventsLoadingMore = false;
   String? _expandedEventId;
 
   User? get _user => FirebaseAuth.instance.currentUser;
@@ -65,10 +72,12 @@ class _AdminDashboardScreenState extends State<AdminDashboardScreen> {
     });
     try {
       await _refreshToken();
-      final response = await _client!.getAgents();
+      final response = await _client!.getAgents(search: _search);
       if (mounted) {
         setState(() {
           _agents = response.agents;
+          _total = response.total;
+          _nextCursor = response.nextCursor;
           _loading = false;
         });
       }
@@ -82,6 +91,36 @@ class _AdminDashboardScreenState extends State<AdminDashboardScreen> {
     }
   }
 
+  Future<void> _loadMoreAgents() async {
+    final cursor = _nextCursor;
+    if (cursor == null || _loadingMore) return;
+    setState(() => _loadingMore = true);
+    try {
+      await _refreshToken();
+      final response =
+          await _client!.getAgents(cursor: cursor, search: _search);
+      if (mounted) {
+        setState(() {
+          _agents = [...?_agents, ...response.agents];
+          _nextCursor = response.nextCursor;
+          _loadingMore = false;
+        });
+      }
+    } catch (e) {
+      if (mounted) {
+        setState(() => _loadingMore = false);
+        ScaffoldMessenger.of(context).showSnackBar(
+          SnackBar(content: Text(e.toString())),
+        );
+      }
+    }
+  }
+
+  void _searchAgents(String value) {
+    _search = value.trim();
+    _loadAgents();
+  }
+
   Future<void> _toggleAgent(String agentId) async {
     if (_expandedAgentId == agentId) {
       setState(() {
@@ -95,16 +134,19 @@ class _AdminDashboardScreenState extends State<AdminDashboardScreen> {
     setState(() {
       _expandedAgentId = agentId;
       _expandedEvents = null;
+      _expandedEventsCursor = null;
       _eventsLoading = true;
       _expandedEventId = null;
     });
 
     try {
       await _refreshToken();
-      final events = await _client!.getAgentEvents(agentId);
+      final page = await _client!.getAgentEvents(agentId);
       if (mounted) {
         setState(() {
-          _expandedEvents = events;
+          _expandedEvents = page.events;
+          _expandedEventCount = page.agent.eventCount;
+          _expandedEventsCursor = page.nextCursor;
           _eventsLoading = false;
         });
       }
@@ -118,6 +160,31 @@ class _AdminDashboardScreenState extends State<AdminDashboardScreen> {
     }
   }
 
+  Future<void> _loadMoreEvents() async {
+    final agentId = _expandedAgentId;
+    final cursor = _expandedEventsCursor;
+    if (agentId == null || cursor == null || _eventsLoadingMore) return;
+    setState(() => _eventsLoadingMore = true);
+    try {
+      await _refreshToken();
+      final page = await _client!.getAgentEvents(agentId, cursor: cursor);
+      if (mounted && _expandedAgentId == agentId) {
+        setState(() {
+          _expandedEvents = [...?_expandedEvents, ...page.events];
+          _expandedEventsCursor = page.nextCursor;
+          _eventsLoadingMore = false;
+        });
+      }
+    } catch (e) {
+      if (mounted) {
+        setState(() => _eventsLoadingMore = false);
+        ScaffoldMessenger.of(context).showSnackBar(
+          SnackBar(content: Text(e.toString())),
+        );
+      }
+    }
+  }
+
   void _toggleEvent(String eventId) {
     setState(() {
       _expandedEventId = _expandedEventId == eventId ? null : eventId;
@@ -179,7 +246,7 @@ class _AdminDashboardScreenState extends State<AdminDashboardScreen> {
 
   Future<void> _deleteAllEvents(ThemeData theme) async {
     final agentId = _expandedAgentId;
-    final count = _expandedEvents?.length ?? 0;
+    final count = _expandedEventCount;
     if (agentId == null || count == 0) return;
     final confirmed = await _confirm(
       theme,
@@ -189,10 +256,11 @@ class _AdminDashboardScreenState extends State<AdminDashboardScreen> {
     if (!confirmed) return;
     try {
       await _refreshToken();
-      await _client!.deleteAgentEvents(agentId);
+      final job = await _client!.deleteAgentEvents(agentId);
       if (mounted) {
         _toggleAgent(agentId);
         _loadAgents();
+        _followPurge(job);
       }
     } catch (e) {
       if (mounted) {
@@ -203,6 +271,42 @@ class _AdminDashboardScreenState extends State<AdminDashboardScreen> {
     }
   }
 
+  /// Purges run in the background on the server: poll the job and refresh
+  /// the list once it has finished.
+  Future<void> _followPurge(PurgeJob job) async {
+    ScaffoldMessenger.of(context).showSnackBar(
+      SnackBar(
+        content: Text(
+          'Deleting ${job.total} event${job.total == 1 ? '' : 's'} '
+          'in the background…',
+        ),
+      ),
+    );
+    var current = job;
+    try {
+      while (!current.isFinished) {
+        await Future.delayed(const Duration(seconds: 2));
+        if (!mounted) return;
+        await _refreshToken();
+        current = await _client!.getJob(job.id);
+      }
+    } catch (_) {
+      return;
+    }
+    if (!mounted) return;
+    ScaffoldMessenger.of(context).showSnackBar(
+      SnackBar(
+        content: Text(
+          current.status == 'done'
+              ? 'Deleted ${current.deleted} event${current.deleted == 1 ? '' : 's'}'
+                  '${current.deleteAgent ? ' and the agent' : ''}.'
+              : 'Purge failed: ${current.error ?? 'unknown error'}',
+        ),
+      ),
+    );
+    _loadAgents();
+  }
+
   Future<void> _deleteAgent(ThemeData theme, AdminAgent agent) async {
     final confirmed = await _confirm(
       theme,
@@ -216,13 +320,14 @@ class _AdminDashboardScreenState extends State<AdminDashboardScreen> {
     if (!confirmed) return;
     try {
       await _refreshToken();
-      await _client!.deleteAgent(agent.id);
+      final job = await _client!.deleteAgent(agent.id);
       if (mounted) {
         if (_expandedAgentId == agent.id) {
           _expandedAgentId = null;
           _expandedEvents = null;
         }
         _loadAgents();
+        _followPurge(job);
       }
     } catch (e) {
       if (mounted) {
@@ -308,7 +413,7 @@ class _AdminDashboardScreenState extends State<AdminDashboardScreen> {
     }
 
     final agents = _agents ?? [];
-    if (agents.isEmpty) {
+    if (agents.isEmpty && _search.isEmpty) {
       return const Center(child: Text('No registered agents.'));
     }
 
@@ -319,8 +424,30 @@ class _AdminDashboardScreenState extends State<AdminDashboardScreen> {
           onRefresh: _loadAgents,
           child: ListView.builder(
             padding: const EdgeInsets.all(16),
-            itemCount: agents.length + 1,
+            itemCount: agents.length + 2,
             itemBuilder: (context, index) {
+              if (index == agents.length + 1) {
+                if (agents.isEmpty) {
+                  return const Padding(
+                    padding: EdgeInsets.all(24),
+                    child: Center(child: Text('No matching agents.')),
+                  );
+                }
+                if (_nextCursor == null) return const SizedBox.shrink();
+                return Padding(
+                  padding: const EdgeInsets.symmetric(vertical: 8),
+                  child: Center(
+                    child: _loadingMore
+                        ? const CircularProgressIndicator()
+                        : OutlinedButton(
+                            onPressed: _loadMoreAgents,
+                            child: Text(
+                              'Load more (${agents.length} of $_total)',
+                            ),
+                          ),
+                  ),
+                );
+              }
               if (index == 0) {
                 return Padding(
                   padding: const EdgeInsets.only(bottom: 16),
@@ -343,11 +470,25 @@ class _AdminDashboardScreenState extends State<AdminDashboardScreen> {
                           borderRadius: BorderRadius.circular(12),
                         ),
                         child: Text(
-                          '${agents.length}',
+                          '$_total',
                           style: theme.textTheme.labelLarge,
                         ),
                       ),
                       const Spacer(),
+                      SizedBox(
+                        width: 240,
+                        child: TextFormField(
+                          initialValue: _search,
+                          decoration: const InputDecoration(
+                            isDense: true,
+                            prefixIcon: Icon(Icons.search, size: 18),
+                            hintText: 'Search email or name',
+                          ),
+                          textInputAction: TextInputAction.search,
+                          onFieldSubmitted: _searchAgents,
+                        ),
+                      ),
+                      const SizedBox(width: 4),
                       IconButton(
                         icon: const Icon(Icons.refresh),
                         tooltip: 'Refresh',
@@ -508,6 +649,20 @@ class _AdminDashboardScreenState extends State<AdminDashboardScreen> {
             ),
           ),
           ...events.map((e) => _buildEventRow(theme, e)),
+          if (_expandedEventsCursor != null)
+            Padding(
+              padding: const EdgeInsets.symmetric(vertical: 8),
+              child: Center(
+                child: _eventsLoadingMore
+                    ? const CircularProgressIndicator(strokeWidth: 2)
+                    : TextButton(
+                        onPressed: _loadMoreEvents,
+                        child: Text(
+                          'Load more (${events.length} of $_expandedEventCount)',
+                        ),
+                      ),
+              ),
+            ),
           const SizedBox(height: 8),
         ],
       ),